@@ -1,16 +1,21 @@
 import sqlite3
 
+from modulo3.aula6 import query_stats
+from modulo3.aula6.query_stats import QueryStats
+
 class DatabaseConnection:
 
-    def __init__(self, db_name="database.db"):
+    def __init__(self, db_name="database.db", stats: QueryStats | None = None):
         self.db_name = db_name
+        # Instrumentação por statement; sem `stats` vale a do query_stats.enable().
+        self.stats = stats
         self.conn = None
         self.cursor = None
 
     def connect(self):
         """Abre a conexão com o banco de dados."""
         if self.conn is None:
-            self.conn = sqlite3.connect(self.db_name)
+            self.conn = query_stats.connect(self.db_name, self.stats)
             self.conn.row_factory = sqlite3.Row
             self.cursor = self.conn.cursor()
 
@@ -0,0 +1,164 @@
+# async_user_service.py
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from database import ConnectionPool, DatabaseConnection
+from hasher import HashTimeoutError, hash_senha, precisa_rehash, verificar_senha
+from user_model import UserModel
+from user_service import MENSAGEM_SOBRECARGA, UserService
+
+
+class AsyncUserService:
+    """
+    Fachada asyncio do UserService: os mesmos métodos, como awaitables.
+    O acesso ao SQLite roda em um executor próprio, com um pool de conexões
+    exclusivo do tamanho desse executor, e o hash das senhas vai para o pool de
+    hash. Assim o event loop nunca bloqueia em I/O de banco nem em KDF.
+    """
+
+    def __init__(
+        self,
+        db_name: str = "escola.db",
+        db_workers: int = 4,
+        hash_concurrency: int = 32,
+        user_service: UserService | None = None,
+    ):
+        if user_service is None:
+            user_model = UserModel(db_name)
+            user_model.db_conn = DatabaseConnection(
+                db_name, pool=ConnectionPool(db_name, max_size=db_workers)
+            )
+            user_service = UserService(user_model)
+        self.user_service = user_service
+        self.user_model = user_service.user_model
+        self.hasher_pool = user_service.hasher_pool
+        self._db_executor = ThreadPoolExecutor(db_workers, thread_name_prefix="sqlite")
+        # Limita quantos hashes este serviço coloca na fila do pool ao mesmo tempo.
+        self._hash_slots = asyncio.Semaphore(hash_concurrency)
+
+    async def _db(self, funcao, *args):
+        """Executa uma chamada síncrona de banco no executor de SQLite."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._db_executor, partial(funcao, *args))
+
+    async def _hash(self, funcao, *args):
+        """Executa uma função de hash no pool de hash sem bloquear o event loop."""
+        async with self._hash_slots:
+            future = self.hasher_pool.try_submit(funcao, *args)
+            if future is None:
+                raise HashTimeoutError("Fila de hash cheia.")
+            try:
+                return await asyncio.wait_for(
+                    asyncio.wrap_future(future), self.hasher_pool.timeout
+                )
+            except asyncio.TimeoutError as e:
+                raise HashTimeoutError("O hash da senha excedeu o tempo limite.") from e
+
+    async def register_user(
+        self,
+        senha: str,
+        email: str,
+        nome_completo: str,
+        perfil: str = "Afiliado",
+    ) -> tuple[bool, str]:
+        """Versão assíncrona de UserService.register_user."""
+        error = self.user_service._validate_registration(senha, email, nome_completo)
+        if error:
+            return False, error
+        try:
+            senha_hash = await self._hash(hash_senha, senha)
+        except HashTimeoutError:
+            return False, MENSAGEM_SOBRECARGA
+        return await self._db(
+            self.user_model.create_user, senha_hash, email, nome_completo, perfil
+        )
+
+    async def login_user(self, email: str, senha: str) -> tuple[dict | None, str]:
+        """Versão assíncrona de UserService.login_user."""
+        if not email or not senha:
+            return None, "Erro: Email e senha não podem ser vazios."
+
+        user = await self._db(self.user_model.find_user_by_email, email)
+        if not user:
+            return None, "Erro: Email ou senha inválidos."
+
+        try:
+            valid = await self._hash(verificar_senha, senha, user["senha_hash"])
+        except HashTimeoutError:
+            return None, MENSAGEM_SOBRECARGA
+
+        if valid:
+            if precisa_rehash(user["senha_hash"]):
+                self.hasher_pool.try_submit(
+                    self.user_service._upgrade_password_hash, user["id"], senha
+                )
+            return self.user_service._safe_user_data(user), "Login bem-sucedido!"
+
+        return None, "Erro: Email ou senha inválidos."
+
+    async def update_user_profile(
+        self,
+        current_user_id: int | None,
+        current_user_profile: str,
+        target_user_id: int,
+        new_data: dict,
+    ) -> tuple[bool, str]:
+        """Versão assíncrona de UserService.update_user_profile."""
+        if not self.user_service._is_authorized(
+            current_user_id, current_user_profile, target_user_id
+        ):
+            return False, "Acesso Negado!"
+
+        error = self.user_service._validate_profile_update(new_data)
+        if error:
+            return False, error
+
+        update_data = {}
+        if new_data.get("senha"):
+            try:
+                update_data["senha_hash"] = await self._hash(hash_senha, new_data["senha"])
+            except HashTimeoutError:
+                return False, MENSAGEM_SOBRECARGA
+        if new_data.get("email"):
+            update_data["email"] = new_data["email"]
+        if new_data.get("nome_completo"):
+            update_data["nome_completo"] = new_data["nome_completo"]
+
+        if update_data:
+            return await self._db(
+                self.user_model.update_user_by_id, target_user_id, update_data
+            )
+
+        return False, "Nenhum dado válido para atualização fornecido."
+
+    async def delete_user(self, current_user_profile: str, user_id: int) -> tuple[bool, str]:
+        """Versão assíncrona de UserService.delete_user."""
+        return await self._db(self.user_service.delete_user, current_user_profile, user_id)
+
+    async def get_user_by_id(self, user_id: int) -> dict | None:
+        """Versão assíncrona de UserService.get_user_by_id."""
+        return await self._db(self.user_service.get_user_by_id, user_id)
+
+    async def get_users_page(
+        self,
+        after_id: int = 0,
+        page_size: int = 50,
+    ) -> tuple[list[dict], int | None]:
+        """Versão assíncrona de UserService.get_users_page."""
+        return await self._db(self.user_service.get_users_page, after_id, page_size)
+
+    async def get_all_users(self) -> list[dict | None]:
+        """Versão assíncrona de UserService.get_all_users."""
+        return await self._db(self.user_service.get_all_users)
+
+    def close(self):
+        """Encerra o executor de SQLite e fecha as conexões ociosas."""
+        self._db_executor.shutdown(wait=True)
+        self.user_model.db_conn.pool.close_all()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,101 @@
+# bench_pool.py
+"""
+Compara operações/segundo de login e busca por e-mail antes (uma conexão
+nova por operação) e depois (conexões emprestadas do ConnectionPool).
+
+Uso: python bench_pool.py [--usuarios 1000] [--operacoes 5000] [--threads 4]
+"""
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import hasher
+from hasher import hash_senha, verificar_senha
+from user_model import UserModel
+
+
+class LegacyConnection:
+    """Reproduz o padrão antigo: connect() e close() a cada operação."""
+
+    def __init__(self, db_name):
+        self.db_name = db_name
+
+    def find_user_by_email(self, email):
+        conn = sqlite3.connect(self.db_name)
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+        cursor.execute("PRAGMA foreign_keys = ON;")
+        cursor.execute("SELECT * FROM usuarios WHERE email = ?;", (email,))
+        user = cursor.fetchone()
+        conn.commit()
+        conn.close()
+        return user
+
+
+def _popular(model: UserModel, quantidade: int) -> list[str]:
+    senha_hash = hash_senha("senha_valida")
+    emails = [f"usuario{i}@bench.com" for i in range(quantidade)]
+    with model.db_conn.connection() as conn:
+        conn.executemany(
+            "INSERT INTO usuarios (email, senha_hash, nome_completo) VALUES (?, ?, ?);",
+            [(email, senha_hash, "Usuario Bench") for email in emails],
+        )
+    return emails
+
+
+def _medir(funcao, emails, operacoes, threads) -> float:
+    """Executa `operacoes` chamadas distribuídas em `threads` e devolve ops/s."""
+
+    def trabalho(inicio):
+        for i in range(inicio, operacoes, threads):
+            funcao(emails[i % len(emails)])
+
+    comeco = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(trabalho, range(threads)))
+    return operacoes / (time.perf_counter() - comeco)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--usuarios", type=int, default=1000)
+    parser.add_argument("--operacoes", type=int, default=5000)
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+    # Custo mínimo de KDF para que o tempo medido seja o das conexões, não o do hash.
+    hasher.configurar("pbkdf2-sha256", i=1)
+
+    with tempfile.TemporaryDirectory() as pasta:
+        db_name = os.path.join(pasta, "bench.db")
+        model = UserModel(db_name)
+        emails = _popular(model, args.usuarios)
+        legado = LegacyConnection(db_name)
+
+        def login_legado(email):
+            user = legado.find_user_by_email(email)
+            return verificar_senha("senha_valida", user["senha_hash"])
+
+        def login_pool(email):
+            user = model.find_user_by_email(email)
+            return verificar_senha("senha_valida", user["senha_hash"])
+
+        cenarios = [
+            ("busca por e-mail", legado.find_user_by_email, model.find_user_by_email),
+            ("login", login_legado, login_pool),
+        ]
+        print(f"{'operação':<18}{'antes (ops/s)':>16}{'depois (ops/s)':>16}{'ganho':>8}")
+        for nome, antes, depois in cenarios:
+            ops_antes = _medir(antes, emails, args.operacoes, args.threads)
+            ops_depois = _medir(depois, emails, args.operacoes, args.threads)
+            print(
+                f"{nome:<18}{ops_antes:>16.0f}{ops_depois:>16.0f}"
+                f"{ops_depois / ops_antes:>7.1f}x"
+            )
+        model.db_conn.pool.close_all()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+# benchmark_usuarios.py
+"""
+Benchmark da camada de usuários (UserService + UserModel) sobre SQLite real.
+
+Para cada tamanho de base (padrão: 10k, 100k e 1M usuários) e cada modo
+(memória e disco), popula um banco novo e mede register_user, login_user,
+get_user_by_id, update_user_profile, delete_user e get_all_users, gerando
+p50/p95/p99 (ms) e ops/s em JSON.
+
+Uso:
+    python benchmark_usuarios.py --saida baseline.json
+    python benchmark_usuarios.py --tamanhos 10000 --modos disco --comparar baseline.json --limite 0.15
+
+Com --comparar, o processo termina com código 1 se alguma métrica piorar mais
+que --limite (fração) em relação ao baseline: p50/p95/p99 subindo ou ops/s caindo.
+Por padrão a KDF usa custo mínimo (--hash-parametros) para medir a camada de
+usuários e não o hash; passe os parâmetros de produção para incluir o custo dele.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+import hasher
+from user_model import UserModel
+from user_service import UserService
+
+OPERACOES = [
+    "register_user",
+    "login_user",
+    "get_user_by_id",
+    "update_user_profile",
+    "delete_user",
+    "get_all_users",
+]
+SENHA = "senha_do_benchmark"
+
+
+def popular(model: UserModel, quantidade: int, lote: int = 50_000):
+    """Insere `quantidade` usuários direto com executemany (sem passar pelo serviço)."""
+    senha_hash = hasher.hash_senha(SENHA)
+    with model.db_conn.connection() as conn:
+        for inicio in range(0, quantidade, lote):
+            fim = min(inicio + lote, quantidade)
+            conn.executemany(
+                "INSERT INTO usuarios (senha_hash, email, nome_completo) VALUES (?, ?, ?);",
+                ((senha_hash, f"user{i}@bench.com", "Usuario Bench") for i in range(inicio, fim)),
+            )
+
+
+def percentil(amostras: list[float], p: float) -> float:
+    """Percentil pelo método do vizinho mais próximo (amostras já ordenadas)."""
+    indice = min(len(amostras) - 1, max(0, round(p / 100 * len(amostras)) - 1))
+    return amostras[indice]
+
+
+def resumir(tempos_ns: list[int]) -> dict:
+    ordenados = sorted(t / 1_000_000 for t in tempos_ns)
+    total_s = sum(tempos_ns) / 1_000_000_000
+    return {
+        "amostras": len(ordenados),
+        "p50_ms": round(percentil(ordenados, 50), 4),
+        "p95_ms": round(percentil(ordenados, 95), 4),
+        "p99_ms": round(percentil(ordenados, 99), 4),
+        "ops_s": round(len(ordenados) / total_s, 1) if total_s else None,
+    }
+
+
+def cronometrar(funcao, argumentos) -> list[int]:
+    tempos = []
+    for args in argumentos:
+        comeco = time.perf_counter_ns()
+        funcao(*args)
+        tempos.append(time.perf_counter_ns() - comeco)
+    return tempos
+
+
+def medir_cenario(db_name: str, tamanho: int, iteracoes: int, iteracoes_listagem: int) -> dict:
+    model = UserModel(db_name)
+    service = UserService(model)
+    popular(model, tamanho)
+    sorteio = random.Random(tamanho)
+    amostras = min(iteracoes, tamanho)
+
+    # Cada operação sorteia os próprios ids, para que uma não aqueça o cache da outra.
+    def sortear_ids():
+        return [sorteio.randint(1, tamanho) for _ in range(iteracoes)]
+
+    removidos = sorteio.sample(range(1, tamanho + 1), amostras)
+    argumentos = {
+        "register_user": [
+            (SENHA, f"novo{i}@bench.com", "Usuario Novo") for i in range(iteracoes)
+        ],
+        "login_user": [(f"user{i - 1}@bench.com", SENHA) for i in sortear_ids()],
+        "get_user_by_id": [(i,) for i in sortear_ids()],
+        "update_user_profile": [
+            (1, "Diretoria", i, {"nome_completo": "Nome Atualizado"}) for i in sortear_ids()
+        ],
+        "delete_user": [("Diretoria", i) for i in removidos],
+        "get_all_users": [() for _ in range(iteracoes_listagem)],
+    }
+
+    resultados = {}
+    for operacao in OPERACOES:
+        tempos = cronometrar(getattr(service, operacao), argumentos[operacao])
+        resultados[operacao] = resumir(tempos)
+        print(f"  {operacao:<20} {resultados[operacao]}", file=sys.stderr)
+    model.db_conn.pool.close_all()
+    return resultados
+
+
+def comparar(atual: dict, baseline: dict, limite: float) -> list[str]:
+    """Lista as métricas que pioraram mais que `limite` em relação ao baseline."""
+    regressoes = []
+    for cenario, operacoes in atual["resultados"].items():
+        for operacao, metricas in operacoes.items():
+            referencia = baseline.get("resultados", {}).get(cenario, {}).get(operacao)
+            if not referencia:
+                continue
+            for chave in ("p50_ms", "p95_ms", "p99_ms"):
+                if referencia[chave] and metricas[chave] > referencia[chave] * (1 + limite):
+                    regressoes.append(
+                        f"{cenario}/{operacao} {chave}: {referencia[chave]} -> {metricas[chave]}"
+                    )
+            if referencia["ops_s"] and metricas["ops_s"] < referencia["ops_s"] * (1 - limite):
+                regressoes.append(
+                    f"{cenario}/{operacao} ops_s: {referencia['ops_s']} -> {metricas['ops_s']}"
+                )
+    return regressoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da camada de usuários.")
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--modos", nargs="+", choices=["memoria", "disco"], default=["memoria", "disco"])
+    parser.add_argument("--iteracoes", type=int, default=1000)
+    parser.add_argument("--iteracoes-listagem", type=int, default=3)
+    parser.add_argument("--hash-parametros", default="$pbkdf2-sha256$i=1")
+    parser.add_argument("--saida", help="arquivo JSON de saída (padrão: stdout)")
+    parser.add_argument("--comparar", help="JSON de baseline para detectar regressões")
+    parser.add_argument("--limite", type=float, default=0.10)
+    args = parser.parse_args()
+
+    algoritmo, parametros = hasher.ler_configuracao(args.hash_parametros)
+    hasher.configurar(algoritmo, **parametros)
+
+    relatorio = {
+        "meta": {
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "plataforma": platform.platform(),
+            "iteracoes": args.iteracoes,
+            "hash": args.hash_parametros,
+        },
+        "resultados": {},
+    }
+    with tempfile.TemporaryDirectory() as pasta:
+        for modo in args.modos:
+            for tamanho in args.tamanhos:
+                cenario = f"{modo}-{tamanho}"
+                print(f"{cenario}:", file=sys.stderr)
+                db_name = ":memory:" if modo == "memoria" else os.path.join(pasta, f"{cenario}.db")
+                relatorio["resultados"][cenario] = medir_cenario(
+                    db_name, tamanho, args.iteracoes, args.iteracoes_listagem
+                )
+
+    texto = json.dumps(relatorio, indent=2, ensure_ascii=False)
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            arquivo.write(texto + "\n")
+    else:
+        print(texto)
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as arquivo:
+            regressoes = comparar(relatorio, json.load(arquivo), args.limite)
+        for regressao in regressoes:
+            print(f"REGRESSÃO {regressao}", file=sys.stderr)
+        if regressoes:
+            sys.exit(1)
+        print("Nenhuma regressão acima do limite.", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
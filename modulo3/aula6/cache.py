@@ -0,0 +1,112 @@
+# cache.py
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable
+
+
+class UserCache:
+    """
+    Cache LRU com TTL de usuários, indexado pelo id e pelo e-mail.
+    Guarda a linha inteira uma única vez (por id); o e-mail é só um apelido para o id.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        ttl: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: OrderedDict[int, tuple[float, Any]] = OrderedDict()
+        self._ids_by_email: dict[str, int] = {}
+        self._lock = threading.Lock()
+        # Incrementado a cada invalidação; impede que uma leitura anterior
+        # à escrita recoloque no cache um valor desatualizado.
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get_by_id(self, user_id: int):
+        """Retorna o usuário em cache pelo id, ou None (miss)."""
+        with self._lock:
+            return self._get(user_id)
+
+    def get_by_email(self, email: str):
+        """Retorna o usuário em cache pelo e-mail, ou None (miss)."""
+        with self._lock:
+            user_id = self._ids_by_email.get(email)
+            if user_id is None:
+                self.misses += 1
+                return None
+            return self._get(user_id)
+
+    def _get(self, user_id: int):
+        entry = self._entries.get(user_id)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, user = entry
+        if expires_at <= self._clock():
+            self._remove(user_id)
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(user_id)
+        self.hits += 1
+        return user
+
+    def put(self, user, generation: int):
+        """
+        Guarda um usuário lido do banco. `generation` é o valor de self.generation
+        lido antes da consulta; se houve invalidação desde então, nada é guardado.
+        """
+        if user is None:
+            return
+        with self._lock:
+            if generation != self.generation:
+                return
+            user_id = user["id"]
+            self._remove(user_id)
+            self._entries[user_id] = (self._clock() + self.ttl, user)
+            self._ids_by_email[user["email"]] = user_id
+            while len(self._entries) > self.max_size:
+                oldest_id = next(iter(self._entries))
+                self._remove(oldest_id)
+                self.evictions += 1
+
+    def invalidate(self, user_id: int):
+        """Remove o usuário (e o seu e-mail) do cache após uma escrita."""
+        with self._lock:
+            self.generation += 1
+            self._remove(user_id)
+
+    def clear(self):
+        """Esvazia o cache sem zerar os contadores."""
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self._ids_by_email.clear()
+
+    def _remove(self, user_id: int):
+        entry = self._entries.pop(user_id, None)
+        if entry is not None:
+            email = entry[1]["email"]
+            if self._ids_by_email.get(email) == user_id:
+                del self._ids_by_email[email]
+
+    def stats(self) -> dict:
+        """Contadores para dimensionar o cache."""
+        with self._lock:
+            return {
+                "tamanho": len(self._entries),
+                "capacidade": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
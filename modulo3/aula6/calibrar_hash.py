@@ -0,0 +1,63 @@
+# calibrar_hash.py
+"""
+Escolhe os parâmetros de custo da KDF para que um hash leve cerca de
+`--alvo-ms` milissegundos nesta máquina.
+
+Uso: python calibrar_hash.py [--alvo-ms 50] [--algoritmo scrypt|pbkdf2-sha256]
+A última linha impressa pode ser exportada para que hasher.py use os parâmetros:
+    export HASH_SENHA_PARAMETROS='$scrypt$n=32768,r=8,p=1'
+"""
+import argparse
+import hashlib
+import secrets
+import time
+
+from hasher import PARAMETROS_PADRAO, derivar
+
+
+def medir_ms(algoritmo: str, parametros: dict, repeticoes: int = 3) -> float:
+    """Mediana do tempo de um hash, em milissegundos."""
+    salt = secrets.token_bytes(16)
+    tempos = []
+    for _ in range(repeticoes):
+        comeco = time.perf_counter()
+        derivar("senha de calibracao", salt, algoritmo, parametros)
+        tempos.append((time.perf_counter() - comeco) * 1000)
+    return sorted(tempos)[len(tempos) // 2]
+
+
+def calibrar(alvo_ms: float, algoritmo: str) -> tuple[dict, float]:
+    """
+    Dobra o custo (n no scrypt, iterações no PBKDF2) enquanto o hash ficar abaixo
+    do alvo e devolve o maior custo que não passa dele (ou o mínimo, se até ele passar).
+    """
+    chave = "n" if algoritmo == "scrypt" else "i"
+    parametros = dict(PARAMETROS_PADRAO[algoritmo])
+    parametros[chave] = 2**10 if algoritmo == "scrypt" else 10_000
+    tempo = medir_ms(algoritmo, parametros)
+    while True:
+        proximo = {**parametros, chave: parametros[chave] * 2}
+        tempo_proximo = medir_ms(algoritmo, proximo)
+        if tempo_proximo > alvo_ms:
+            return parametros, tempo
+        parametros, tempo = proximo, tempo_proximo
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Calibração do custo do hash de senhas.")
+    parser.add_argument("--alvo-ms", type=float, default=50.0)
+    parser.add_argument(
+        "--algoritmo",
+        choices=list(PARAMETROS_PADRAO),
+        default="scrypt" if hasattr(hashlib, "scrypt") else "pbkdf2-sha256",
+    )
+    args = parser.parse_args()
+
+    parametros, tempo = calibrar(args.alvo_ms, args.algoritmo)
+    texto = ",".join(f"{chave}={valor}" for chave, valor in parametros.items())
+    print(f"{args.algoritmo} com {texto}: {tempo:.1f} ms por hash (alvo {args.alvo_ms} ms)")
+    print(f"export HASH_SENHA_PARAMETROS='${args.algoritmo}${texto}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,31 +1,165 @@
 import sqlite3
+import threading
+from contextlib import contextmanager
+
+import query_stats
+from query_stats import QueryStats
+
+
+class ConnectionPool:
+    """
+    Pool limitado de conexões SQLite de longa duração.
+    Cada conexão é configurada uma única vez (WAL, busy_timeout e foreign_keys)
+    e a thread que já tem uma conexão emprestada recebe sempre a mesma.
+    """
+
+    def __init__(
+        self,
+        db_name: str,
+        max_size: int = 5,
+        timeout: float = 5.0,
+        busy_timeout_ms: int = 5000,
+        stats: QueryStats | None = None,
+    ):
+        self.db_name = db_name
+        # Instrumentação por statement; sem `stats` vale a do query_stats.enable().
+        self.stats = stats
+        # Cada conexão ':memory:' é um banco diferente, então só pode haver uma.
+        self.max_size = 1 if db_name == ":memory:" else max_size
+        self.timeout = timeout
+        self.busy_timeout_ms = busy_timeout_ms
+        self._idle: list[sqlite3.Connection] = []
+        self._slots = threading.BoundedSemaphore(self.max_size)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._closed = False
+
+    def _new_connection(self) -> sqlite3.Connection:
+        """Abre e configura uma conexão nova (executado uma vez por conexão)."""
+        conn = query_stats.connect(
+            self.db_name,
+            self.stats,
+            timeout=self.busy_timeout_ms / 1000,
+            check_same_thread=False,
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)};")
+        conn.execute("PRAGMA journal_mode = WAL;")
+        # Ativa o suporte a FOREIGN KEYs no SQLite, essencial para integridade
+        conn.execute("PRAGMA foreign_keys = ON;")
+        return conn
+
+    def acquire(self) -> sqlite3.Connection:
+        """Retira uma conexão do pool, esperando até `timeout` segundos por uma vaga."""
+        if self._closed:
+            raise RuntimeError("O pool de conexões já foi fechado.")
+        if not self._slots.acquire(timeout=self.timeout):
+            raise TimeoutError(
+                f"Nenhuma conexão livre para '{self.db_name}' após {self.timeout}s."
+            )
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        try:
+            return self._new_connection()
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, conn: sqlite3.Connection):
+        """Devolve uma conexão ao pool (ou a fecha, se o pool já foi encerrado)."""
+        with self._lock:
+            if self._closed:
+                conn.close()
+            else:
+                self._idle.append(conn)
+        self._slots.release()
+
+    @contextmanager
+    def connection(self):
+        """
+        Empresta uma conexão para o bloco `with`.
+        Ao sair sem erro faz commit; com erro faz rollback. Blocos aninhados na
+        mesma thread reutilizam a conexão e a transação do bloco mais externo.
+        """
+        local = self._local
+        conn = getattr(local, "conn", None)
+        if conn is not None:
+            local.depth += 1
+            try:
+                yield conn
+            finally:
+                local.depth -= 1
+            return
+
+        conn = self.acquire()
+        local.conn = conn
+        local.depth = 1
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            local.conn = None
+            local.depth = 0
+            self.release(conn)
+
+    def close_all(self):
+        """Fecha as conexões ociosas; as emprestadas são fechadas ao voltar."""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+_pools: dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_name: str, max_size: int = 5) -> ConnectionPool:
+    """Retorna o pool compartilhado do arquivo `db_name`, criando-o se necessário."""
+    with _pools_lock:
+        pool = _pools.get(db_name)
+        if pool is None or pool._closed:
+            pool = ConnectionPool(db_name, max_size=max_size)
+            _pools[db_name] = pool
+        return pool
 
 
 class DatabaseConnection:
     """
     Gerencia a conexão com o banco de dados SQLite.
     Define a abertura, o fechamento e a persistência (commit).
+    As conexões vêm de um pool compartilhado por arquivo de banco.
     """
 
-    def __init__(self, db_name="escola.db"):
+    def __init__(self, db_name="escola.db", pool_size=5, pool: ConnectionPool | None = None):
         self.db_name = db_name
+        # Um pool próprio pode ser injetado; senão usa o compartilhado do arquivo.
+        self.pool = pool if pool is not None else get_pool(db_name, pool_size)
         self.conn = None
         self.cursor = None
+        self._borrowed = None
+
+    def connection(self):
+        """Context manager que empresta uma conexão do pool (commit ao final)."""
+        return self.pool.connection()
 
     def connect(self):
         """Abre a conexão com o banco de dados e configura o RowFactory."""
         if self.conn is None:
-            self.conn = sqlite3.connect(self.db_name)
-            self.conn.row_factory = sqlite3.Row
+            self._borrowed = self.pool.connection()
+            self.conn = self._borrowed.__enter__()
             self.cursor = self.conn.cursor()
 
-            # Ativa o suporte a FOREIGN KEYs no SQLite, essencial para integridade
-            self.cursor.execute("PRAGMA foreign_keys = ON;")
-
     def close(self):
         """Fecha a conexão com o banco de dados, salvando as alterações."""
         if self.conn:
-            self.conn.commit()
-            self.conn.close()
+            borrowed = self._borrowed
             self.conn = None
-            self.cursor = None
\ No newline at end of file
+            self.cursor = None
+            self._borrowed = None
+            borrowed.__exit__(None, None, None)  # type: ignore
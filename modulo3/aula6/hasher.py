@@ -1,12 +1,188 @@
 # hasher.py
+"""
+Hash de senhas com KDF salgada e custo ajustável (scrypt ou PBKDF2).
+
+O hash gerado descreve os próprios parâmetros, por exemplo:
+    $scrypt$n=16384,r=8,p=1$<salt base64>$<hash base64>
+    $pbkdf2-sha256$i=200000$<salt base64>$<hash base64>
+Hashes antigos (SHA-256 puro, 64 caracteres hexadecimais) ainda são aceitos por
+verificar_senha e marcados por precisa_rehash para serem trocados no próximo login.
+Os parâmetros padrão podem ser sobrescritos pela variável de ambiente
+HASH_SENHA_PARAMETROS (ex.: "$scrypt$n=32768,r=8,p=1"), gerada por calibrar_hash.py.
+"""
+import base64
 import hashlib
+import hmac
+import os
+import secrets
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+SALT_BYTES = 16
+HASH_BYTES = 32
+
+PARAMETROS_PADRAO = {
+    "scrypt": {"n": 2**14, "r": 8, "p": 1},
+    "pbkdf2-sha256": {"i": 200_000},
+}
+
+
+class HashTimeoutError(TimeoutError):
+    """O pool de hash está cheio ou demorou mais que o limite para responder."""
+
+
+def _b64(data: bytes) -> str:
+    return base64.b64encode(data).decode("ascii").rstrip("=")
+
+
+def _unb64(text: str) -> bytes:
+    return base64.b64decode(text + "=" * (-len(text) % 4))
+
+
+def _formatar_parametros(parametros: dict) -> str:
+    return ",".join(f"{chave}={valor}" for chave, valor in parametros.items())
+
+
+def _ler_parametros(texto: str) -> dict:
+    return {chave: int(valor) for chave, valor in (p.split("=") for p in texto.split(","))}
+
+
+def ler_configuracao(texto: str) -> tuple[str, dict]:
+    """Lê um cabeçalho '$algoritmo$parametros' (o início de um hash) e o valida."""
+    _, algoritmo, parametros = texto.split("$")[:3]
+    if algoritmo not in PARAMETROS_PADRAO:
+        raise ValueError(f"Algoritmo de hash desconhecido: {algoritmo}")
+    return algoritmo, _ler_parametros(parametros)
+
+
+def _configuracao_inicial() -> tuple[str, dict]:
+    texto = os.environ.get("HASH_SENHA_PARAMETROS")
+    if texto:
+        return ler_configuracao(texto)
+    if hasattr(hashlib, "scrypt"):
+        return "scrypt", dict(PARAMETROS_PADRAO["scrypt"])
+    return "pbkdf2-sha256", dict(PARAMETROS_PADRAO["pbkdf2-sha256"])
+
+
+ALGORITMO, PARAMETROS = _configuracao_inicial()
+
+
+def configurar(algoritmo: str, **parametros: int):
+    """Troca o algoritmo e os parâmetros usados pelos próximos hash_senha."""
+    global ALGORITMO, PARAMETROS
+    if algoritmo not in PARAMETROS_PADRAO:
+        raise ValueError(f"Algoritmo de hash desconhecido: {algoritmo}")
+    ALGORITMO = algoritmo
+    PARAMETROS = {**PARAMETROS_PADRAO[algoritmo], **parametros}
+
+
+def derivar(senha: str, salt: bytes, algoritmo: str, parametros: dict) -> bytes:
+    """Executa a KDF escolhida sobre a senha."""
+    senha_bytes = senha.encode("utf-8")
+    if algoritmo == "scrypt":
+        n, r, p = parametros["n"], parametros["r"], parametros["p"]
+        return hashlib.scrypt(
+            senha_bytes,
+            salt=salt,
+            n=n,
+            r=r,
+            p=p,
+            maxmem=256 * r * (n + p),
+            dklen=HASH_BYTES,
+        )
+    return hashlib.pbkdf2_hmac(
+        "sha256", senha_bytes, salt, parametros["i"], dklen=HASH_BYTES
+    )
 
 
 def hash_senha(senha: str) -> str:
-    """Gera um hash SHA-256 da senha."""
+    """Gera o hash salgado da senha com o algoritmo e os parâmetros atuais."""
+    salt = secrets.token_bytes(SALT_BYTES)
+    digest = derivar(senha, salt, ALGORITMO, PARAMETROS)
+    return f"${ALGORITMO}${_formatar_parametros(PARAMETROS)}${_b64(salt)}${_b64(digest)}"
+
+
+def _hash_legado(senha: str) -> str:
+    """Hash antigo: SHA-256 sem salt (mantido só para verificar contas antigas)."""
     return hashlib.sha256(senha.encode("utf-8")).hexdigest()
 
 
 def verificar_senha(senha_digitada: str, hash_armazenado: str) -> bool:
     """Verifica se a senha digitada corresponde ao hash no banco."""
-    return hash_senha(senha_digitada) == hash_armazenado
\ No newline at end of file
+    if not hash_armazenado:
+        return False
+    if not hash_armazenado.startswith("$"):
+        return hmac.compare_digest(_hash_legado(senha_digitada), hash_armazenado)
+    try:
+        _, algoritmo, parametros, salt, digest = hash_armazenado.split("$")
+        if algoritmo not in PARAMETROS_PADRAO:
+            return False
+        calculado = derivar(
+            senha_digitada, _unb64(salt), algoritmo, _ler_parametros(parametros)
+        )
+    except ValueError:
+        return False
+    return hmac.compare_digest(calculado, _unb64(digest))
+
+
+def precisa_rehash(hash_armazenado: str) -> bool:
+    """True se o hash é legado ou usa parâmetros diferentes dos atuais."""
+    prefixo = f"${ALGORITMO}${_formatar_parametros(PARAMETROS)}$"
+    return not hash_armazenado.startswith(prefixo)
+
+
+class HasherPool:
+    """
+    Executa o trabalho de KDF em um pool limitado de threads (hashlib libera o GIL),
+    com fila de tamanho máximo e tempo limite, para não travar quem chama.
+    """
+
+    def __init__(self, max_workers: int = 4, max_pending: int = 64, timeout: float = 2.0):
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="hasher")
+        self._pending = threading.BoundedSemaphore(max_pending)
+
+    def submit(self, funcao, *args) -> Future:
+        """Enfileira `funcao(*args)`; falha com HashTimeoutError se a fila ficar cheia."""
+        if not self._pending.acquire(timeout=self.timeout):
+            raise HashTimeoutError("Fila de hash cheia.")
+        try:
+            future = self._executor.submit(funcao, *args)
+        except Exception:
+            self._pending.release()
+            raise
+        future.add_done_callback(lambda _: self._pending.release())
+        return future
+
+    def try_submit(self, funcao, *args) -> Future | None:
+        """Como submit, mas desiste na hora (retorna None) se a fila estiver cheia."""
+        if not self._pending.acquire(blocking=False):
+            return None
+        future = self._executor.submit(funcao, *args)
+        future.add_done_callback(lambda _: self._pending.release())
+        return future
+
+    def run(self, funcao, *args):
+        """Executa `funcao(*args)` no pool e espera o resultado até o tempo limite."""
+        future = self.submit(funcao, *args)
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError as e:
+            future.cancel()
+            raise HashTimeoutError("O hash da senha excedeu o tempo limite.") from e
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+
+_default_pool: HasherPool | None = None
+_default_pool_lock = threading.Lock()
+
+
+def get_hasher_pool() -> HasherPool:
+    """Retorna o pool de hash compartilhado pelo processo."""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = HasherPool()
+        return _default_pool
@@ -0,0 +1,72 @@
+# importar_usuarios.py
+"""
+Importa usuários em massa a partir de um arquivo CSV ou JSONL.
+
+Cada linha precisa dos campos senha, email e nome_completo (perfil é opcional).
+O relatório de cada linha é impresso em JSONL na saída padrão e o resumo vai
+para a saída de erro.
+
+Uso: python importar_usuarios.py usuarios.csv [--formato csv|jsonl] [--lote 1000]
+     [--processos N] [--db escola.db]
+     (use "-" no lugar do arquivo para ler da entrada padrão)
+"""
+import argparse
+import csv
+import json
+import sys
+from typing import Iterator, TextIO
+
+from user_model import UserModel
+from user_service import UserService
+
+
+def ler_csv(arquivo: TextIO) -> Iterator[dict]:
+    """Lê as linhas de um CSV com cabeçalho, uma por vez."""
+    yield from csv.DictReader(arquivo)
+
+
+def ler_jsonl(arquivo: TextIO) -> Iterator[dict]:
+    """Lê um objeto JSON por linha, ignorando linhas em branco."""
+    for linha in arquivo:
+        if linha.strip():
+            try:
+                yield json.loads(linha)
+            except json.JSONDecodeError:
+                yield {}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Importação de usuários em massa.")
+    parser.add_argument("arquivo", help="arquivo CSV/JSONL ou '-' para stdin")
+    parser.add_argument("--formato", choices=["csv", "jsonl"])
+    parser.add_argument("--lote", type=int, default=1000)
+    parser.add_argument("--processos", type=int, default=None)
+    parser.add_argument("--db", default="escola.db")
+    args = parser.parse_args()
+
+    formato = args.formato or ("csv" if args.arquivo.endswith(".csv") else "jsonl")
+    leitor = ler_csv if formato == "csv" else ler_jsonl
+
+    user_service = UserService(UserModel(args.db))
+    arquivo = (
+        sys.stdin
+        if args.arquivo == "-"
+        else open(args.arquivo, encoding="utf-8", newline="")
+    )
+    sucessos = erros = 0
+    with arquivo:
+        relatorio = user_service.register_users_bulk(
+            leitor(arquivo), chunk_size=args.lote, processes=args.processos
+        )
+        for resultado in relatorio:
+            print(json.dumps(resultado, ensure_ascii=False))
+            if resultado["sucesso"]:
+                sucessos += 1
+            else:
+                erros += 1
+
+    print(f"Importação concluída: {sucessos} cadastrados, {erros} com erro.", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,14 @@
 # main.py
 from user_service import UserService
-from typing import Optional, Dict
 
-# Simula a sessão do usuário logado
-CURRENT_USER_SESSION: Dict[str, Optional[str] | Optional[int]] = {
-    "id": None,
-    "perfil": "Deslogado",
-}
+# Quantidade de usuários exibidos por página na listagem
+PAGE_SIZE = 10
 
 
-def display_menu():
+def display_menu(perfil: str):
     """Exibe o menu de opções."""
     print(
-        f"\n--- Gerenciador de Usuários (Logado como: {CURRENT_USER_SESSION['perfil']}) ---"
+        f"\n--- Gerenciador de Usuários (Logado como: {perfil}) ---"
     )
     options = [
         "1. Cadastrar novo usuário (Email, Nome, Senha)",
@@ -22,7 +18,7 @@ def display_menu():
     ]
     for opt in options:
         print(opt)
-    if CURRENT_USER_SESSION["perfil"] == "Diretoria":
+    if perfil == "Diretoria":
         print("5. Deletar *Qualquer* Usuário (Diretoria)")
     else:
         print("5. (Acesso Restrito: Deletar Usuário)")
@@ -39,9 +35,14 @@ def display_menu():
 def main():
     """Função principal do programa."""
     user_service = UserService()
+    # Token opaco da sessão do usuário logado (None quando deslogado)
+    session_token: str | None = None
 
     while True:
-        display_menu()
+        session = user_service.get_session(session_token)
+        if session is None:
+            session_token = None
+        display_menu(session["perfil"] if session else "Deslogado")
         choice = input("Escolha uma opção: ")
 
         if choice == "1":
@@ -63,11 +64,10 @@ def main():
             email = input("E-mail: ")
             senha = input("Senha: ")
 
-            user, message = user_service.login_user(email, senha)
+            user_service.end_session(session_token)
+            session_token, user, message = user_service.start_session(email, senha)
             print(message)
             if user:
-                CURRENT_USER_SESSION["id"] = user["id"]
-                CURRENT_USER_SESSION["perfil"] = user["perfil_acesso"]
                 print(f"Login bem-sucedido! Bem-vindo(a), {user['nome_completo']}.")
             input("\nPressione Enter para continuar...")
 
@@ -89,12 +89,12 @@ def main():
 
         elif choice == "4":
             print("\n--- Editar *Meu* Perfil ---")
-            if not CURRENT_USER_SESSION["id"]:
+            if session is None:
                 print("Você precisa estar logado para editar seu perfil.")
                 input("\nPressione Enter para continuar...")
                 continue
 
-            print(f"Editando Perfil ID: {CURRENT_USER_SESSION['id']}")
+            print(f"Editando Perfil ID: {session['id']}")
             print("Deixe em branco os campos que não deseja alterar.")
             new_data = {
                 "nome_completo": input("Novo Nome Completo: ") or None,
@@ -102,10 +102,9 @@ def main():
                 "senha": input("Nova Senha: ") or None,
             }
 
-            success, message = user_service.update_user_profile(
-                CURRENT_USER_SESSION["id"], # type: ignore
-                CURRENT_USER_SESSION["perfil"], # type: ignore
-                CURRENT_USER_SESSION["id"], # type: ignore
+            success, message = user_service.update_user_profile_with_token(
+                session_token,
+                session["id"],
                 new_data,
             )
             print(message)
@@ -114,15 +113,15 @@ def main():
         elif choice == "5":
             print("\n--- Deletar Usuário ---")
 
-            if CURRENT_USER_SESSION["perfil"] != "Diretoria":
+            if session is None or session["perfil"] != "Diretoria":
                 print("Acesso negado. Apenas a Diretoria pode deletar usuários.")
                 input("\nPressione Enter para continuar...")
                 continue
 
             try:
                 user_id = int(input("Digite o ID do usuário a ser deletado: "))
-                success, message = user_service.delete_user(
-                    CURRENT_USER_SESSION["perfil"], user_id # pyright: ignore[reportArgumentType]
+                success, message = user_service.delete_user_with_token(
+                    session_token, user_id
                 )
                 print(message)
             except ValueError:
@@ -131,20 +130,27 @@ def main():
 
         elif choice == "6":
             print("\n--- Lista de Usuários ---")
-            users = user_service.get_all_users()
-            if users:
+            cursor = 0
+            shown = 0
+            while True:
+                users, cursor = user_service.get_users_page(cursor, PAGE_SIZE)
+                shown += len(users)
                 for user in users:
                     print(
-                        f"ID: {user['id']} | Perfil: {user['perfil_acesso']} | Nome: {user['nome_completo']} | E-mail: {user['email']}" # type: ignore
+                        f"ID: {user['id']} | Perfil: {user['perfil_acesso']} | Nome: {user['nome_completo']} | E-mail: {user['email']}"
                     )
-            else:
+                if cursor is None:
+                    break
+                if input("\nEnter para a próxima página ou 'q' para parar: ").lower() == "q":
+                    break
+            if not shown:
                 print("Nenhum usuário cadastrado.")
             input("\nPressione Enter para continuar...")
 
         elif choice == "7":
             print("Logout realizado.")
-            CURRENT_USER_SESSION["id"] = None
-            CURRENT_USER_SESSION["perfil"] = "Deslogado"
+            user_service.end_session(session_token)
+            session_token = None
             input("\nPressione Enter para continuar...")
 
         elif choice == "8":
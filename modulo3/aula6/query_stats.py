@@ -0,0 +1,256 @@
+# query_stats.py
+"""
+Instrumentação por statement das conexões SQLite.
+
+Quando ativada, as conexões são abertas com InstrumentedConnection, cujo cursor
+mede cada execute/executemany e agrega por modelo de SQL (espaços normalizados e
+literais trocados por '?'): contagem, histograma de latência, linhas retornadas e
+afetadas. Consultas acima de `slow_ms` vão para o logger "query_stats".
+Desativada, as conexões são sqlite3.Connection comuns (custo zero).
+
+Ativação: query_stats.enable(slow_ms=50) ou variável de ambiente QUERY_STATS=1
+(QUERY_STATS_SLOW_MS define o limite). Com QUERY_STATS_DUMP=arquivo.json as
+estatísticas são gravadas ao final do processo; para lê-las:
+    python query_stats.py arquivo.json [--ordem total_ms|count|p95_ms|max_ms|rows_returned]
+"""
+import argparse
+import atexit
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+
+logger = logging.getLogger("query_stats")
+
+# Limites superiores (em µs) dos baldes do histograma: 1, 2, 4, ... ~33 s.
+BUCKET_BOUNDS_US = [2**i for i in range(26)]
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_SPACES = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=1024)
+def normalize_sql(sql: str) -> str:
+    """Transforma um SQL no seu modelo: espaços colapsados e literais viram '?'."""
+    return _SPACES.sub(" ", _LITERALS.sub("?", sql)).strip()
+
+
+class _TemplateStats:
+    __slots__ = ("count", "total_ns", "max_ns", "rows_returned", "rows_affected", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.rows_returned = 0
+        self.rows_affected = 0
+        self.buckets = [0] * (len(BUCKET_BOUNDS_US) + 1)
+
+    def percentile_ms(self, p: float) -> float:
+        """Estimativa do percentil pelo limite superior do balde (limitada ao máximo visto)."""
+        target = p / 100 * self.count
+        seen = 0
+        for index, amount in enumerate(self.buckets):
+            seen += amount
+            if amount and seen >= target:
+                if index < len(BUCKET_BOUNDS_US):
+                    return min(BUCKET_BOUNDS_US[index] / 1000, self.max_ns / 1_000_000)
+                break
+        return self.max_ns / 1_000_000
+
+
+class QueryStats:
+    """Agrega as métricas de todos os statements das conexões instrumentadas."""
+
+    def __init__(self, slow_ms: float = 100.0):
+        self.slow_ms = slow_ms
+        self._templates: dict[str, _TemplateStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, sql: str, elapsed_ns: int, rows_affected: int):
+        template = normalize_sql(sql)
+        elapsed_us = elapsed_ns // 1000
+        bucket = min(elapsed_us.bit_length(), len(BUCKET_BOUNDS_US))
+        with self._lock:
+            stats = self._templates.get(template)
+            if stats is None:
+                stats = self._templates[template] = _TemplateStats()
+            stats.count += 1
+            stats.total_ns += elapsed_ns
+            stats.max_ns = max(stats.max_ns, elapsed_ns)
+            stats.buckets[bucket] += 1
+            if rows_affected > 0:
+                stats.rows_affected += rows_affected
+        if elapsed_ns >= self.slow_ms * 1_000_000:
+            logger.warning("Consulta lenta (%.2f ms): %s", elapsed_ns / 1_000_000, template)
+
+    def add_rows(self, sql: str, rows: int):
+        """Soma linhas lidas (fetch) ao modelo do último execute do cursor."""
+        if rows:
+            template = normalize_sql(sql)
+            with self._lock:
+                stats = self._templates.get(template)
+                if stats is not None:
+                    stats.rows_returned += rows
+
+    def snapshot(self) -> dict:
+        """Retorna um dict {modelo de SQL: métricas} pronto para JSON."""
+        with self._lock:
+            return {
+                template: {
+                    "count": stats.count,
+                    "total_ms": round(stats.total_ns / 1_000_000, 3),
+                    "mean_ms": round(stats.total_ns / stats.count / 1_000_000, 4),
+                    "p50_ms": stats.percentile_ms(50),
+                    "p95_ms": stats.percentile_ms(95),
+                    "p99_ms": stats.percentile_ms(99),
+                    "max_ms": round(stats.max_ns / 1_000_000, 3),
+                    "rows_returned": stats.rows_returned,
+                    "rows_affected": stats.rows_affected,
+                }
+                for template, stats in self._templates.items()
+            }
+
+    def reset(self):
+        with self._lock:
+            self._templates.clear()
+
+    def dump(self, path: str):
+        with open(path, "w", encoding="utf-8") as arquivo:
+            json.dump(self.snapshot(), arquivo, indent=2, ensure_ascii=False)
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """Cursor que mede cada statement e conta as linhas lidas."""
+
+    _sql = ""
+
+    def execute(self, sql, parameters=()):
+        start = time.perf_counter_ns()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._record(sql, start)
+
+    def executemany(self, sql, seq_of_parameters):
+        start = time.perf_counter_ns()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self._record(sql, start)
+
+    def _record(self, sql: str, start: int):
+        self._sql = sql
+        self.connection.query_stats.record(  # type: ignore[attr-defined]
+            sql, time.perf_counter_ns() - start, self.rowcount
+        )
+
+    def _count(self, rows: int):
+        self.connection.query_stats.add_rows(self._sql, rows)  # type: ignore[attr-defined]
+
+    def fetchone(self):
+        row = super().fetchone()
+        if row is not None:
+            self._count(1)
+        return row
+
+    def fetchmany(self, size=None):
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self._count(len(rows))
+        return rows
+
+    def fetchall(self):
+        rows = super().fetchall()
+        self._count(len(rows))
+        return rows
+
+    def __next__(self):
+        row = super().__next__()
+        self._count(1)
+        return row
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """Conexão cujos cursores (inclusive os de conn.execute) são instrumentados."""
+
+    query_stats: QueryStats
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+def connect(database: str, query_stats: QueryStats | None = None, **kwargs) -> sqlite3.Connection:
+    """sqlite3.connect que instrumenta a conexão quando há um QueryStats ativo."""
+    stats = query_stats if query_stats is not None else _active
+    if stats is None:
+        return sqlite3.connect(database, **kwargs)
+    conn = sqlite3.connect(database, factory=InstrumentedConnection, **kwargs)
+    conn.query_stats = stats  # type: ignore[attr-defined]
+    return conn
+
+
+_active: QueryStats | None = None
+
+
+def enable(slow_ms: float = 100.0) -> QueryStats:
+    """Liga a instrumentação para as conexões abertas daqui em diante."""
+    global _active
+    if _active is None:
+        _active = QueryStats(slow_ms)
+    else:
+        _active.slow_ms = slow_ms
+    return _active
+
+
+def disable():
+    """Desliga a instrumentação para as próximas conexões."""
+    global _active
+    _active = None
+
+
+def get_query_stats() -> QueryStats | None:
+    """O QueryStats ativo no processo (None se desativado)."""
+    return _active
+
+
+if os.environ.get("QUERY_STATS"):
+    enable(float(os.environ.get("QUERY_STATS_SLOW_MS", "100")))
+    if os.environ.get("QUERY_STATS_DUMP"):
+        atexit.register(lambda: _active and _active.dump(os.environ["QUERY_STATS_DUMP"]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exibe estatísticas gravadas por QUERY_STATS_DUMP.")
+    parser.add_argument("arquivo")
+    parser.add_argument(
+        "--ordem",
+        choices=["total_ms", "count", "p95_ms", "max_ms", "rows_returned"],
+        default="total_ms",
+    )
+    parser.add_argument("--limite", type=int, default=20)
+    args = parser.parse_args()
+
+    with open(args.arquivo, encoding="utf-8") as arquivo:
+        stats = json.load(arquivo)
+    ordenados = sorted(stats.items(), key=lambda item: item[1][args.ordem], reverse=True)
+    print(f"{'count':>8} {'total ms':>10} {'p50':>8} {'p95':>8} {'p99':>8} {'linhas':>8}  SQL")
+    for template, metricas in ordenados[: args.limite]:
+        linhas = metricas["rows_returned"] + metricas["rows_affected"]
+        print(
+            f"{metricas['count']:>8} {metricas['total_ms']:>10.2f} {metricas['p50_ms']:>8.3f}"
+            f" {metricas['p95_ms']:>8.3f} {metricas['p99_ms']:>8.3f} {linhas:>8}  {template[:100]}"
+        )
+
+
+if __name__ == "__main__":
+    main()
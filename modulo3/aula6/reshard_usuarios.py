@@ -0,0 +1,39 @@
+# reshard_usuarios.py
+"""
+Redistribui os usuários de um ShardedUserModel entre um novo conjunto de shards.
+
+Uso:
+    python reshard_usuarios.py --mapa shards.json --novos s0.db s1.db s2.db s3.db
+    python reshard_usuarios.py --mapa shards.json --atuais s0.db s1.db --novos s0.db s1.db s2.db
+
+Se o arquivo do --mapa ainda não existe, o layout atual é o padrão para os --atuais
+(bucket % N). Ao final, o mapa é regravado com o novo layout.
+"""
+import argparse
+import os
+import sys
+
+from sharded_user_model import ShardedUserModel
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Redistribui os usuários entre shards SQLite.")
+    parser.add_argument("--mapa", required=True, help="arquivo JSON com o mapa de buckets")
+    parser.add_argument("--atuais", nargs="+", help="shards atuais (quando o mapa ainda não existe)")
+    parser.add_argument("--novos", nargs="+", required=True)
+    args = parser.parse_args()
+
+    if os.path.exists(args.mapa):
+        model = ShardedUserModel.from_map_file(args.mapa, cache_size=0)
+    elif args.atuais:
+        model = ShardedUserModel(args.atuais, cache_size=0)
+    else:
+        parser.error("informe --atuais quando o arquivo do --mapa não existe")
+
+    movidos = model.reshard(args.novos, map_path=args.mapa)
+    model.close()
+    print(f"{movidos} usuário(s) movido(s) para {len(args.novos)} shard(s).", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
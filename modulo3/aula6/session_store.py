@@ -0,0 +1,154 @@
+# session_store.py
+import hashlib
+import secrets
+import sys
+import threading
+import time
+from typing import Callable
+
+from database import DatabaseConnection
+
+
+class SessionStore:
+    """
+    Sessões de login com tokens opacos.
+    Cada sessão ocupa uma tupla (user_id, perfil, expira_em) indexada pelo SHA-256
+    do token (o token em si nunca é guardado). A expiração é feita por uma roda de
+    tempo (timer wheel): cada posição da roda guarda as sessões que vencem naquele
+    intervalo, então expirar custa só o que venceu, sem varrer todas as sessões.
+    Com `db_name`, as sessões também são gravadas no SQLite e recarregadas no início.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 1800.0,
+        tick: float = 1.0,
+        wheel_size: int = 3600,
+        db_name: str | None = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.ttl = ttl
+        self.tick = tick
+        self.wheel_size = wheel_size
+        self._clock = clock
+        self._sessions: dict[bytes, tuple[int, str, float]] = {}
+        self._by_user: dict[int, set[bytes]] = {}
+        self._wheel: list[set[bytes]] = [set() for _ in range(wheel_size)]
+        self._current_tick = int(clock() // tick)
+        self._lock = threading.Lock()
+        self.expired = 0
+        self.db_conn = DatabaseConnection(db_name) if db_name else None
+        if self.db_conn is not None:
+            self._load()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def create(self, user_id: int, perfil: str) -> str:
+        """Abre uma sessão e devolve o token opaco que o cliente deve apresentar."""
+        token = secrets.token_urlsafe(32)
+        key = self._key(token)
+        expires_at = self._clock() + self.ttl
+        with self._lock:
+            self._advance()
+            self._add(key, user_id, sys.intern(perfil), expires_at)
+        if self.db_conn is not None:
+            with self.db_conn.connection() as conn:
+                conn.execute(
+                    "INSERT INTO sessoes (chave, user_id, perfil, expira_em) VALUES (?, ?, ?, ?);",
+                    (key, user_id, perfil, expires_at),
+                )
+        return token
+
+    def get(self, token: str | None) -> dict | None:
+        """Retorna {"id", "perfil"} da sessão do token, ou None se inválido/expirado."""
+        if not token:
+            return None
+        key = self._key(token)
+        with self._lock:
+            self._advance()
+            session = self._sessions.get(key)
+            if session is None or session[2] <= self._clock():
+                return None
+        return {"id": session[0], "perfil": session[1]}
+
+    def revoke(self, token: str | None):
+        """Encerra a sessão do token (logout)."""
+        if not token:
+            return
+        key = self._key(token)
+        with self._lock:
+            self._remove(key)
+        self._delete_persisted("chave = ?", (key,))
+
+    def revoke_user(self, user_id: int):
+        """Encerra todas as sessões de um usuário (ex.: quando ele é deletado)."""
+        with self._lock:
+            for key in list(self._by_user.get(user_id, ())):
+                self._remove(key)
+        self._delete_persisted("user_id = ?", (user_id,))
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._advance()
+            return len(self._sessions)
+
+    def _add(self, key: bytes, user_id: int, perfil: str, expires_at: float):
+        self._sessions[key] = (user_id, perfil, expires_at)
+        self._by_user.setdefault(user_id, set()).add(key)
+        self._wheel[int(expires_at // self.tick) % self.wheel_size].add(key)
+
+    def _remove(self, key: bytes) -> tuple[int, str, float] | None:
+        session = self._sessions.pop(key, None)
+        if session is not None:
+            self._wheel[int(session[2] // self.tick) % self.wheel_size].discard(key)
+            keys = self._by_user.get(session[0])
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_user[session[0]]
+        return session
+
+    def _advance(self):
+        """Gira a roda até o tick atual, expirando só as posições que passaram."""
+        now = self._clock()
+        target = int(now // self.tick)
+        # Depois de uma volta inteira, todas as posições já foram visitadas.
+        start = max(self._current_tick + 1, target - self.wheel_size + 1)
+        expired = []
+        for tick in range(start, target + 1):
+            bucket = self._wheel[tick % self.wheel_size]
+            # A posição também guarda sessões de voltas futuras (TTL maior que a roda).
+            expired.extend(key for key in bucket if self._sessions[key][2] <= now)
+        self._current_tick = max(self._current_tick, target)
+        for key in expired:
+            self._remove(key)
+        self.expired += len(expired)
+        if expired and self.db_conn is not None:
+            self._delete_persisted("expira_em <= ?", (now,))
+
+    def _delete_persisted(self, where: str, params: tuple):
+        if self.db_conn is not None:
+            with self.db_conn.connection() as conn:
+                conn.execute(f"DELETE FROM sessoes WHERE {where};", params)
+
+    def _load(self):
+        """Cria a tabela de sessões e recarrega as que ainda não expiraram."""
+        now = self._clock()
+        with self.db_conn.connection() as conn:  # type: ignore
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS sessoes (
+                    chave BLOB PRIMARY KEY,
+                    user_id INTEGER NOT NULL,
+                    perfil TEXT NOT NULL,
+                    expira_em REAL NOT NULL
+                );
+            """
+            )
+            conn.execute("DELETE FROM sessoes WHERE expira_em <= ?;", (now,))
+            rows = conn.execute("SELECT chave, user_id, perfil, expira_em FROM sessoes;")
+            with self._lock:
+                for key, user_id, perfil, expires_at in rows:
+                    self._add(key, user_id, sys.intern(perfil), expires_at)
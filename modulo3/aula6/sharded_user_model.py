@@ -0,0 +1,422 @@
+# sharded_user_model.py
+import heapq
+import json
+import sqlite3
+import threading
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Iterable
+
+from cache import UserCache
+from database import DatabaseConnection
+from user_model import SAFE_COLUMNS, UPDATABLE_COLUMNS, UserModel, _update_query
+
+# Os usuários são distribuídos em 1024 buckets virtuais, e cada bucket mora em um shard.
+BUCKET_BITS = 10
+NUM_BUCKETS = 1 << BUCKET_BITS
+BUCKET_MASK = NUM_BUCKETS - 1
+
+_SCHEMA = f"""
+    CREATE TABLE IF NOT EXISTS usuarios (
+        id INTEGER PRIMARY KEY,
+        senha_hash TEXT NOT NULL,
+        email TEXT NOT NULL UNIQUE,
+        nome_completo TEXT,
+        perfil_acesso TEXT DEFAULT 'Afiliado',
+        data_criacao DATETIME DEFAULT CURRENT_TIMESTAMP,
+        data_atualizacao DATETIME DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE INDEX IF NOT EXISTS idx_usuarios_bucket ON usuarios ((id & {BUCKET_MASK}));
+    CREATE TABLE IF NOT EXISTS emails (
+        email TEXT PRIMARY KEY,
+        user_id INTEGER NOT NULL,
+        bucket INTEGER NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_emails_bucket ON emails (bucket);
+"""
+
+# O id global é (sequência do shard << BUCKET_BITS) | bucket: o próprio id diz em
+# qual bucket (e portanto em qual shard) o usuário está.
+_INSERT_USER = f"""
+    INSERT INTO usuarios (id, senha_hash, email, nome_completo, perfil_acesso)
+    VALUES (
+        ((((SELECT COALESCE(MAX(id), 0) FROM usuarios) >> {BUCKET_BITS}) + 1) << {BUCKET_BITS}) | ?,
+        ?, ?, ?, ?
+    )
+    RETURNING id;
+"""
+
+_USER_COLUMNS = (
+    "id, senha_hash, email, nome_completo, perfil_acesso, data_criacao, data_atualizacao"
+)
+
+
+def email_bucket(email: str) -> int:
+    """Bucket de um e-mail (estável entre processos)."""
+    return zlib.crc32(email.encode("utf-8")) & BUCKET_MASK
+
+
+class ShardedUserModel(UserModel):
+    """
+    UserModel espalhado por N arquivos SQLite, cada um com o seu lock de escrita.
+
+    Um usuário novo vai para o bucket do hash do seu e-mail e o bucket fica gravado
+    no id, então find_user_by_id consulta um único shard. A tabela `emails` é um
+    índice global particionado pelo próprio e-mail: garante a unicidade e leva do
+    e-mail ao id mesmo depois que o e-mail muda para um bucket de outro shard.
+    Listagens consultam todos os shards em paralelo e intercalam os resultados por id.
+    Escritas que envolvem dois shards não são atômicas em caso de queda; entradas
+    órfãs do índice de e-mails são ignoradas nas leituras.
+    """
+
+    def __init__(
+        self,
+        db_names: list[str],
+        bucket_map: list[int] | None = None,
+        cache_size: int = 1024,
+        cache_ttl: float = 60.0,
+    ):
+        self.cache = UserCache(cache_size, cache_ttl) if cache_size else None
+        self._batcher = None
+        self.shards = [DatabaseConnection(name) for name in db_names]
+        if bucket_map is None:
+            bucket_map = [bucket % len(db_names) for bucket in range(NUM_BUCKETS)]
+        self._bucket_shards = [self.shards[index] for index in bucket_map]
+        self._locks = [threading.Lock() for _ in range(NUM_BUCKETS)]
+        self._executor = ThreadPoolExecutor(thread_name_prefix="shard")
+        for shard in self.shards:
+            self._create_shard_tables(shard)
+
+    @classmethod
+    def from_map_file(cls, path: str, **kwargs) -> "ShardedUserModel":
+        """Abre os shards descritos por um arquivo gerado por save_map."""
+        with open(path, encoding="utf-8") as arquivo:
+            shard_map = json.load(arquivo)
+        return cls(shard_map["shards"], shard_map["buckets"], **kwargs)
+
+    def save_map(self, path: str):
+        """Grava a lista de shards e o shard de cada bucket em JSON."""
+        indexes = {id(shard): index for index, shard in enumerate(self.shards)}
+        shard_map = {
+            "shards": [shard.db_name for shard in self.shards],
+            "buckets": [indexes[id(shard)] for shard in self._bucket_shards],
+        }
+        with open(path, "w", encoding="utf-8") as arquivo:
+            json.dump(shard_map, arquivo)
+
+    def _create_shard_tables(self, shard: DatabaseConnection):
+        with shard.connection() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _create_table(self):
+        for shard in self.shards:
+            self._create_shard_tables(shard)
+
+    @contextmanager
+    def _locked(self, *buckets: int):
+        """Trava os buckets envolvidos (sempre em ordem crescente, para evitar deadlock)."""
+        ordered = sorted(set(buckets))
+        for bucket in ordered:
+            self._locks[bucket].acquire()
+        try:
+            yield
+        finally:
+            for bucket in reversed(ordered):
+                self._locks[bucket].release()
+
+    def _shard_of(self, bucket: int) -> DatabaseConnection:
+        return self._bucket_shards[bucket]
+
+    # --- escrita -------------------------------------------------------------
+
+    def _insert_user(
+        self,
+        conn: sqlite3.Connection,
+        senha_hash: str,
+        email: str,
+        nome_completo: str,
+        perfil_acesso: str,
+    ) -> tuple[bool, str]:
+        """Insere o usuário e a sua entrada no índice de e-mails (mesmo shard)."""
+        bucket = email_bucket(email)
+        conn.execute("SAVEPOINT novo_usuario;")
+        try:
+            user_id = conn.execute(
+                _INSERT_USER, (bucket, senha_hash, email, nome_completo, perfil_acesso)
+            ).fetchone()[0]
+            conn.execute(
+                "INSERT INTO emails (email, user_id, bucket) VALUES (?, ?, ?);",
+                (email, user_id, bucket),
+            )
+            conn.execute("RELEASE novo_usuario;")
+            return True, "Usuário criado com sucesso!"
+        except sqlite3.IntegrityError as e:
+            conn.execute("ROLLBACK TO novo_usuario;")
+            conn.execute("RELEASE novo_usuario;")
+            return False, self._integrity_message(e, email)
+
+    def submit_create_user(
+        self,
+        senha_hash: str,
+        email: str,
+        nome_completo: str,
+        perfil_acesso: str,
+    ) -> Future:
+        bucket = email_bucket(email)
+        try:
+            with self._locked(bucket):
+                with self._shard_of(bucket).connection() as conn:
+                    result = self._insert_user(
+                        conn, senha_hash, email, nome_completo, perfil_acesso
+                    )
+        except Exception as e:
+            result = (False, f"Erro desconhecido: {e}")
+        return self._done_future(result)
+
+    def create_users_bulk(
+        self,
+        users: list[tuple[str, str, str, str]],
+    ) -> list[tuple[bool, str]]:
+        """Agrupa o lote por shard e grava cada grupo em uma única transação."""
+        by_shard: dict[int, tuple[DatabaseConnection, list[int]]] = {}
+        buckets = [email_bucket(user[1]) for user in users]
+        with self._locked(*buckets):
+            for index, bucket in enumerate(buckets):
+                shard = self._shard_of(bucket)
+                by_shard.setdefault(id(shard), (shard, []))[1].append(index)
+            results: list[tuple[bool, str]] = [(False, "")] * len(users)
+            for shard, indexes in by_shard.values():
+                with shard.connection() as conn:
+                    for index in indexes:
+                        results[index] = self._insert_user(conn, *users[index])
+        return results
+
+    def submit_update_user_by_id(self, user_id: int, updates_data: dict) -> Future:
+        columns = tuple(
+            column for column in UPDATABLE_COLUMNS if updates_data.get(column)
+        )
+        if not columns:
+            return self._done_future((False, "Nenhum dado válido para atualizar."))
+
+        params = [updates_data[column] for column in columns]
+        params.append(datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+        params.append(user_id)
+        try:
+            result = self._update_user_sharded(user_id, columns, params, updates_data.get("email"))
+        except Exception as e:
+            result = (False, f"Erro desconhecido: {e}")
+        self._invalidate_cache(user_id)
+        return self._done_future(result)
+
+    def _update_user_sharded(
+        self,
+        user_id: int,
+        columns: tuple[str, ...],
+        params: list,
+        new_email: str | None,
+    ) -> tuple[bool, str]:
+        home_bucket = user_id & BUCKET_MASK
+        while True:
+            old_email = self._current_email(user_id)
+            if old_email is None:
+                return False, "Usuário não encontrado."
+            changes_email = bool(new_email) and new_email != old_email
+            buckets = [home_bucket, email_bucket(old_email)]
+            if changes_email:
+                buckets.append(email_bucket(new_email))  # type: ignore[arg-type]
+            with self._locked(*buckets):
+                # O e-mail pode ter mudado entre a leitura e o lock; nesse caso, tenta de novo.
+                if self._current_email(user_id) != old_email:
+                    continue
+                if not changes_email:
+                    return self._apply_update(home_bucket, columns, params)
+                return self._move_email(user_id, columns, params, old_email, new_email)  # type: ignore[arg-type]
+
+    def _apply_update(self, home_bucket: int, columns, params) -> tuple[bool, str]:
+        try:
+            with self._shard_of(home_bucket).connection() as conn:
+                rows_affected = conn.execute(_update_query(columns), params).rowcount
+        except sqlite3.IntegrityError:
+            return False, "Erro: O e-mail já está em uso por outro usuário."
+        if rows_affected > 0:
+            return True, "Usuário atualizado com sucesso!"
+        return False, "Usuário não encontrado."
+
+    def _move_email(self, user_id, columns, params, old_email: str, new_email: str):
+        """
+        Troca de e-mail: reserva o novo e-mail no índice, atualiza a linha e só então
+        remove o e-mail antigo do índice. Quando os shards coincidem, tudo fica em
+        uma única transação (o pool reaproveita a conexão da thread).
+        """
+        new_bucket = email_bucket(new_email)
+        old_shard = self._shard_of(email_bucket(old_email))
+        home_shard = self._shard_of(user_id & BUCKET_MASK)
+        new_shard = self._shard_of(new_bucket)
+        with old_shard.connection() as old_conn:
+            with home_shard.connection() as home_conn:
+                try:
+                    with new_shard.connection() as new_conn:
+                        new_conn.execute(
+                            "INSERT INTO emails (email, user_id, bucket) VALUES (?, ?, ?);",
+                            (new_email, user_id, new_bucket),
+                        )
+                except sqlite3.IntegrityError:
+                    return False, "Erro: O e-mail já está em uso por outro usuário."
+                try:
+                    home_conn.execute(_update_query(columns), params)
+                except sqlite3.IntegrityError:
+                    self._drop_email_index(new_shard, new_email, user_id)
+                    return False, "Erro: O e-mail já está em uso por outro usuário."
+            old_conn.execute(
+                "DELETE FROM emails WHERE email = ? AND user_id = ?;", (old_email, user_id)
+            )
+        return True, "Usuário atualizado com sucesso!"
+
+    def _drop_email_index(self, shard: DatabaseConnection, email: str, user_id: int):
+        with shard.connection() as conn:
+            conn.execute("DELETE FROM emails WHERE email = ? AND user_id = ?;", (email, user_id))
+
+    def submit_delete_user_by_id(self, user_id: int) -> Future:
+        try:
+            result = self._delete_user_sharded(user_id)
+        except Exception as e:
+            result = (False, f"Erro desconhecido: {e}")
+        self._invalidate_cache(user_id)
+        return self._done_future(result)
+
+    def _delete_user_sharded(self, user_id: int) -> tuple[bool, str]:
+        home_bucket = user_id & BUCKET_MASK
+        while True:
+            email = self._current_email(user_id)
+            if email is None:
+                return False, "Usuário não encontrado."
+            with self._locked(home_bucket, email_bucket(email)):
+                if self._current_email(user_id) != email:
+                    continue
+                with self._shard_of(email_bucket(email)).connection() as email_conn:
+                    with self._shard_of(home_bucket).connection() as home_conn:
+                        home_conn.execute("DELETE FROM usuarios WHERE id = ?;", (user_id,))
+                    email_conn.execute(
+                        "DELETE FROM emails WHERE email = ? AND user_id = ?;", (email, user_id)
+                    )
+                return True, "Usuário deletado com sucesso!"
+
+    def _current_email(self, user_id: int) -> str | None:
+        user = self._select_user_by_id(user_id)
+        return user["email"] if user else None
+
+    # --- leitura -------------------------------------------------------------
+
+    def _select_user_by_id(self, user_id: int):
+        bucket = user_id & BUCKET_MASK
+        with self._locked(bucket):
+            with self._shard_of(bucket).connection() as conn:
+                return conn.execute(
+                    "SELECT * FROM usuarios WHERE id = ?;", (user_id,)
+                ).fetchone()
+
+    def _select_user_by_email(self, email: str):
+        bucket = email_bucket(email)
+        with self._locked(bucket):
+            with self._shard_of(bucket).connection() as conn:
+                row = conn.execute(
+                    "SELECT user_id FROM emails WHERE email = ?;", (email,)
+                ).fetchone()
+        if row is None:
+            return None
+        user = self._select_user_by_id(row["user_id"])
+        # Entrada órfã (troca de e-mail interrompida): o usuário não tem mais esse e-mail.
+        if user is None or user["email"] != email:
+            return None
+        return user
+
+    def _scatter(self, query: str, params: tuple = ()) -> Iterable:
+        """Executa a consulta em todos os shards em paralelo e intercala por id."""
+        shards = list(self.shards)
+
+        def run(shard: DatabaseConnection):
+            with shard.connection() as conn:
+                return conn.execute(query, params).fetchall()
+
+        results = self._executor.map(run, shards)
+        last_id = None
+        # Durante um resharding um bucket pode aparecer em dois shards: descarta repetidos.
+        for row in heapq.merge(*results, key=lambda row: row["id"]):
+            if row["id"] != last_id:
+                last_id = row["id"]
+                yield row
+
+    def get_all_users(self):
+        """Retorna todos os usuários de todos os shards, em ordem de id."""
+        return list(self._scatter("SELECT * FROM usuarios ORDER BY id;"))
+
+    def get_users_page(self, after_id: int = 0, page_size: int = 50) -> list:
+        """Página por chave (id) intercalando a mesma página pedida a cada shard."""
+        rows = self._scatter(
+            f"SELECT {SAFE_COLUMNS} FROM usuarios WHERE id > ? ORDER BY id LIMIT ?;",
+            (after_id, page_size),
+        )
+        return [row for _, row in zip(range(page_size), rows)]
+
+    # --- resharding ----------------------------------------------------------
+
+    def reshard(self, db_names: list[str], map_path: str | None = None) -> int:
+        """
+        Redistribui os buckets entre os shards `db_names`, com o modelo em uso.
+        Cada bucket é copiado para o destino, passa a apontar para lá e só então é
+        apagado da origem; só as operações desse bucket esperam durante a cópia.
+        Retorna quantos usuários foram movidos.
+        """
+        by_name = {shard.db_name: shard for shard in self.shards}
+        targets = []
+        for name in db_names:
+            if name not in by_name:
+                by_name[name] = DatabaseConnection(name)
+                self._create_shard_tables(by_name[name])
+            targets.append(by_name[name])
+        # Enquanto os buckets migram, as listagens consultam os shards antigos e os novos.
+        self.shards = list({id(shard): shard for shard in self.shards + targets}.values())
+
+        moved = 0
+        for bucket in range(NUM_BUCKETS):
+            moved += self._move_bucket(bucket, targets[bucket % len(targets)])
+
+        self.shards = targets
+        if map_path:
+            self.save_map(map_path)
+        return moved
+
+    def _move_bucket(self, bucket: int, target: DatabaseConnection) -> int:
+        with self._locked(bucket):
+            source = self._bucket_shards[bucket]
+            if source is target:
+                return 0
+            with source.connection() as conn:
+                users = conn.execute(
+                    f"SELECT {_USER_COLUMNS} FROM usuarios WHERE (id & {BUCKET_MASK}) = ?;",
+                    (bucket,),
+                ).fetchall()
+                emails = conn.execute(
+                    "SELECT email, user_id, bucket FROM emails WHERE bucket = ?;", (bucket,)
+                ).fetchall()
+            with target.connection() as conn:
+                conn.executemany(
+                    f"INSERT OR REPLACE INTO usuarios ({_USER_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?);",
+                    [tuple(user) for user in users],
+                )
+                conn.executemany(
+                    "INSERT OR REPLACE INTO emails (email, user_id, bucket) VALUES (?, ?, ?);",
+                    [tuple(email) for email in emails],
+                )
+            self._bucket_shards[bucket] = target
+            with source.connection() as conn:
+                conn.execute(
+                    f"DELETE FROM usuarios WHERE (id & {BUCKET_MASK}) = ?;", (bucket,)
+                )
+                conn.execute("DELETE FROM emails WHERE bucket = ?;", (bucket,))
+            return len(users)
+
+    def close(self):
+        self._executor.shutdown(wait=True)
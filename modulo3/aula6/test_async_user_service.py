@@ -0,0 +1,87 @@
+import asyncio
+import time
+
+import pytest
+import hasher
+from async_user_service import AsyncUserService
+
+USUARIOS = 200
+LOGINS = 3000
+
+
+@pytest.fixture
+def parametros_baratos():
+    algoritmo, parametros = hasher.ALGORITMO, hasher.PARAMETROS
+    hasher.configurar("pbkdf2-sha256", i=1000)
+    yield
+    hasher.configurar(algoritmo, **parametros)
+
+
+@pytest.fixture
+def service(tmp_path, parametros_baratos):
+    service = AsyncUserService(str(tmp_path / "async.db"), db_workers=4)
+    rows = (
+        {"senha": "senha_valida", "email": f"user{i}@dominio.com", "nome_completo": "Usuario"}
+        for i in range(USUARIOS)
+    )
+    list(service.user_service.register_users_bulk(rows, processes=0))
+    yield service
+    service.close()
+
+
+def test_milhares_de_logins_simultaneos(service):
+    async def cenario():
+        maior_pausa = 0.0
+        terminou = asyncio.Event()
+
+        async def batimento():
+            # Mede a maior pausa do event loop enquanto os logins acontecem.
+            nonlocal maior_pausa
+            anterior = time.perf_counter()
+            while not terminou.is_set():
+                await asyncio.sleep(0.005)
+                agora = time.perf_counter()
+                maior_pausa = max(maior_pausa, agora - anterior)
+                anterior = agora
+
+        monitor = asyncio.create_task(batimento())
+        resultados = await asyncio.gather(
+            *(
+                service.login_user(
+                    f"user{i % USUARIOS}@dominio.com",
+                    "senha_valida" if i % 10 else "senha_errada",
+                )
+                for i in range(LOGINS)
+            )
+        )
+        terminou.set()
+        await monitor
+        return resultados, maior_pausa
+
+    resultados, maior_pausa = asyncio.run(cenario())
+
+    sucessos = [user for user, _ in resultados if user is not None]
+    falhas = [message for user, message in resultados if user is None]
+    assert len(sucessos) == LOGINS - LOGINS // 10
+    assert set(falhas) == {"Erro: Email ou senha inválidos."}
+    assert all("senha_hash" not in user for user in sucessos)
+    assert maior_pausa < 0.5
+
+
+def test_metodos_assincronos_de_perfil(service):
+    async def cenario():
+        ok, _ = await service.register_user("senha_valida", "novo@dominio.com", "Novo Usuario")
+        user, _ = await service.login_user("novo@dominio.com", "senha_valida")
+        atualizado = await service.update_user_profile(
+            user["id"], "Afiliado", user["id"], {"nome_completo": "Nome Novo"}
+        )
+        encontrado = await service.get_user_by_id(user["id"])
+        removido = await service.delete_user("Diretoria", user["id"])
+        return ok, atualizado, encontrado, removido
+
+    ok, atualizado, encontrado, removido = asyncio.run(cenario())
+
+    assert ok
+    assert atualizado == (True, "Usuário atualizado com sucesso!")
+    assert encontrado["nome_completo"] == "Nome Novo"
+    assert removido == (True, "Usuário deletado com sucesso!")
@@ -0,0 +1,29 @@
+from benchmark_usuarios import comparar, percentil
+
+
+def relatorio(p95, ops):
+    return {
+        "resultados": {
+            "disco-10000": {
+                "login_user": {"p50_ms": 1.0, "p95_ms": p95, "p99_ms": 3.0, "ops_s": ops}
+            }
+        }
+    }
+
+
+def test_percentil_vizinho_mais_proximo():
+    amostras = [float(i) for i in range(1, 101)]
+    assert percentil(amostras, 50) == 50.0
+    assert percentil(amostras, 99) == 99.0
+
+
+def test_comparar_sem_regressao_dentro_do_limite():
+    assert comparar(relatorio(2.1, 950.0), relatorio(2.0, 1000.0), 0.10) == []
+
+
+def test_comparar_detecta_latencia_e_vazao_piores():
+    regressoes = comparar(relatorio(2.5, 800.0), relatorio(2.0, 1000.0), 0.10)
+    assert regressoes == [
+        "disco-10000/login_user p95_ms: 2.0 -> 2.5",
+        "disco-10000/login_user ops_s: 1000.0 -> 800.0",
+    ]
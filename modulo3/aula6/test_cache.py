@@ -0,0 +1,70 @@
+import pytest
+from cache import UserCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(clock):
+    return UserCache(max_size=2, ttl=10.0, clock=clock)
+
+
+def user(user_id, email):
+    return {"id": user_id, "email": email}
+
+
+def test_busca_por_id_e_email(cache):
+    cache.put(user(1, "um@dominio.com"), cache.generation)
+
+    assert cache.get_by_id(1) == user(1, "um@dominio.com")
+    assert cache.get_by_email("um@dominio.com") == user(1, "um@dominio.com")
+    assert cache.get_by_email("outro@dominio.com") is None
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 1
+
+
+def test_entrada_expira_apos_ttl(cache, clock):
+    cache.put(user(1, "um@dominio.com"), cache.generation)
+    clock.now = 10.0
+
+    assert cache.get_by_id(1) is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_remove_menos_recente_ao_lotar(cache):
+    cache.put(user(1, "um@dominio.com"), cache.generation)
+    cache.put(user(2, "dois@dominio.com"), cache.generation)
+    cache.get_by_id(1)
+    cache.put(user(3, "tres@dominio.com"), cache.generation)
+
+    assert cache.get_by_id(2) is None
+    assert cache.get_by_email("dois@dominio.com") is None
+    assert cache.get_by_id(1) is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_invalidacao_remove_email_antigo(cache):
+    cache.put(user(1, "antigo@dominio.com"), cache.generation)
+    cache.invalidate(1)
+
+    assert cache.get_by_email("antigo@dominio.com") is None
+    assert cache.get_by_id(1) is None
+
+
+def test_leitura_anterior_a_invalidacao_nao_entra_no_cache(cache):
+    generation = cache.generation
+    cache.invalidate(1)
+    cache.put(user(1, "velho@dominio.com"), generation)
+
+    assert cache.get_by_id(1) is None
@@ -0,0 +1,62 @@
+import threading
+
+import pytest
+from database import ConnectionPool
+
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = ConnectionPool(str(tmp_path / "teste.db"), max_size=2, timeout=0.1)
+    with pool.connection() as conn:
+        conn.execute("CREATE TABLE itens (id INTEGER PRIMARY KEY, nome TEXT);")
+    yield pool
+    pool.close_all()
+
+
+def test_conexao_configurada_uma_vez(pool):
+    with pool.connection() as conn:
+        assert conn.execute("PRAGMA journal_mode;").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA foreign_keys;").fetchone()[0] == 1
+        assert conn.execute("PRAGMA busy_timeout;").fetchone()[0] == 5000
+
+
+def test_conexao_reutilizada_entre_emprestimos(pool):
+    with pool.connection() as primeira:
+        pass
+    with pool.connection() as segunda:
+        assert segunda is primeira
+
+
+def test_blocos_aninhados_usam_mesma_conexao(pool):
+    with pool.connection() as externa:
+        with pool.connection() as interna:
+            assert interna is externa
+
+
+def test_erro_faz_rollback(pool):
+    with pytest.raises(ValueError):
+        with pool.connection() as conn:
+            conn.execute("INSERT INTO itens (nome) VALUES ('perdido');")
+            raise ValueError("falha")
+    with pool.connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM itens;").fetchone()[0] == 0
+
+
+def test_pool_limitado_gera_timeout(pool):
+    liberar = threading.Event()
+    emprestadas = threading.Barrier(3)
+
+    def segurar():
+        with pool.connection():
+            emprestadas.wait()
+            liberar.wait()
+
+    threads = [threading.Thread(target=segurar) for _ in range(2)]
+    for t in threads:
+        t.start()
+    emprestadas.wait()
+    with pytest.raises(TimeoutError):
+        pool.acquire()
+    liberar.set()
+    for t in threads:
+        t.join()
@@ -0,0 +1,58 @@
+import hashlib
+
+import pytest
+import hasher
+from hasher import HasherPool, HashTimeoutError
+
+
+@pytest.fixture(autouse=True)
+def parametros_baratos():
+    algoritmo, parametros = hasher.ALGORITMO, hasher.PARAMETROS
+    hasher.configurar("pbkdf2-sha256", i=1000)
+    yield
+    hasher.configurar(algoritmo, **parametros)
+
+
+def test_hash_descreve_parametros_e_usa_salt():
+    primeiro = hasher.hash_senha("senha_valida")
+    segundo = hasher.hash_senha("senha_valida")
+
+    assert primeiro.startswith("$pbkdf2-sha256$i=1000$")
+    assert primeiro != segundo
+    assert hasher.verificar_senha("senha_valida", primeiro)
+    assert not hasher.verificar_senha("senha_errada", primeiro)
+
+
+def test_hash_legado_verifica_e_pede_rehash():
+    legado = hashlib.sha256("senha_valida".encode("utf-8")).hexdigest()
+
+    assert hasher.verificar_senha("senha_valida", legado)
+    assert hasher.precisa_rehash(legado)
+
+
+def test_troca_de_parametros_pede_rehash():
+    antigo = hasher.hash_senha("senha_valida")
+    hasher.configurar("pbkdf2-sha256", i=2000)
+
+    assert hasher.precisa_rehash(antigo)
+    assert hasher.verificar_senha("senha_valida", antigo)
+    assert not hasher.precisa_rehash(hasher.hash_senha("senha_valida"))
+
+
+@pytest.mark.parametrize("hash_invalido", ["", "$desconhecido$x=1$a$b", "$pbkdf2-sha256$i=1$!!$"])
+def test_hash_invalido_nao_verifica(hash_invalido):
+    assert not hasher.verificar_senha("senha_valida", hash_invalido)
+
+
+def test_pool_cheio_gera_timeout():
+    import threading
+
+    liberar = threading.Event()
+    pool = HasherPool(max_workers=1, max_pending=1, timeout=0.05)
+    pool.submit(liberar.wait)
+
+    with pytest.raises(HashTimeoutError):
+        pool.run(hasher.hash_senha, "senha_valida")
+    assert pool.try_submit(hasher.hash_senha, "senha_valida") is None
+    liberar.set()
+    pool.shutdown()
@@ -0,0 +1,54 @@
+import logging
+import sqlite3
+
+import pytest
+import query_stats
+from query_stats import QueryStats, normalize_sql
+
+
+@pytest.fixture
+def stats():
+    return QueryStats(slow_ms=1000)
+
+
+@pytest.fixture
+def conn(stats):
+    conn = query_stats.connect(":memory:", stats)
+    conn.execute("CREATE TABLE itens (id INTEGER PRIMARY KEY, nome TEXT);")
+    yield conn
+    conn.close()
+
+
+def test_normaliza_literais_e_espacos():
+    assert (
+        normalize_sql("SELECT *\n  FROM itens WHERE id = 42 AND nome = 'ana';")
+        == "SELECT * FROM itens WHERE id = ? AND nome = ?;"
+    )
+
+
+def test_agrega_por_modelo_com_linhas(conn, stats):
+    conn.executemany("INSERT INTO itens (nome) VALUES (?);", [("a",), ("b",), ("c",)])
+    for item_id in (1, 2):
+        conn.execute(f"SELECT * FROM itens WHERE id = {item_id};").fetchone()
+    list(conn.execute("SELECT * FROM itens;"))
+
+    snapshot = stats.snapshot()
+
+    assert snapshot["INSERT INTO itens (nome) VALUES (?);"]["rows_affected"] == 3
+    assert snapshot["SELECT * FROM itens WHERE id = ?;"]["count"] == 2
+    assert snapshot["SELECT * FROM itens WHERE id = ?;"]["rows_returned"] == 2
+    assert snapshot["SELECT * FROM itens;"]["rows_returned"] == 3
+
+
+def test_consulta_lenta_vai_para_o_log(conn, stats, caplog):
+    stats.slow_ms = 0
+    with caplog.at_level(logging.WARNING, logger="query_stats"):
+        conn.execute("SELECT COUNT(*) FROM itens;")
+    assert "Consulta lenta" in caplog.text
+
+
+def test_desativado_usa_conexao_comum():
+    query_stats.disable()
+    conn = query_stats.connect(":memory:")
+    assert type(conn) is sqlite3.Connection
+    conn.close()
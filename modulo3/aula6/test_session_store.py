@@ -0,0 +1,72 @@
+import pytest
+from session_store import SessionStore
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def store(clock):
+    return SessionStore(ttl=30.0, tick=1.0, wheel_size=10, clock=clock)
+
+
+def test_token_opaco_identifica_usuario(store):
+    token = store.create(7, "Diretoria")
+
+    assert store.get(token) == {"id": 7, "perfil": "Diretoria"}
+    assert store.get("token-inventado") is None
+    assert store.get(None) is None
+
+
+def test_sessao_expira_pela_roda_de_tempo(store, clock):
+    token = store.create(1, "Afiliado")
+    clock.now += 29.5
+    assert store.get(token) is not None
+
+    clock.now += 1
+    assert store.get(token) is None
+    assert len(store) == 0
+    assert store.expired == 1
+
+
+def test_ttl_maior_que_a_roda_sobrevive_as_voltas(store, clock):
+    token = store.create(1, "Afiliado")
+    for _ in range(25):
+        clock.now += 1
+        assert store.get(token) is not None
+    assert len(store) == 1
+
+
+def test_revogar_usuario_encerra_todas_as_sessoes(store):
+    primeira = store.create(3, "Afiliado")
+    segunda = store.create(3, "Afiliado")
+    outra = store.create(4, "Afiliado")
+
+    store.revoke_user(3)
+
+    assert store.get(primeira) is None
+    assert store.get(segunda) is None
+    assert store.get(outra) is not None
+
+
+def test_sessoes_persistidas_sobrevivem_ao_reinicio(tmp_path, clock):
+    db_name = str(tmp_path / "sessoes.db")
+    token = SessionStore(ttl=30.0, db_name=db_name, clock=clock).create(5, "Associado")
+    expirado = SessionStore(ttl=1.0, db_name=db_name, clock=clock).create(6, "Afiliado")
+    clock.now += 5
+
+    reiniciado = SessionStore(ttl=30.0, db_name=db_name, clock=clock)
+
+    assert reiniciado.get(token) == {"id": 5, "perfil": "Associado"}
+    assert reiniciado.get(expirado) is None
+    assert len(reiniciado) == 1
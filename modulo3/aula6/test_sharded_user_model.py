@@ -0,0 +1,121 @@
+import threading
+
+import pytest
+from sharded_user_model import BUCKET_MASK, ShardedUserModel, email_bucket
+
+
+@pytest.fixture
+def shard_names(tmp_path):
+    return [str(tmp_path / f"shard{i}.db") for i in range(3)]
+
+
+@pytest.fixture
+def model(shard_names):
+    model = ShardedUserModel(shard_names)
+    yield model
+    model.close()
+
+
+def criar(model, quantidade, prefixo="user"):
+    for i in range(quantidade):
+        assert model.create_user("hash", f"{prefixo}{i}@teste.com", f"Usuario {i}", "Afiliado")[0]
+
+
+def contar_por_shard(model):
+    contagem = []
+    for shard in model.shards:
+        with shard.connection() as conn:
+            contagem.append(conn.execute("SELECT COUNT(*) FROM usuarios;").fetchone()[0])
+    return contagem
+
+
+def test_usuarios_espalhados_e_id_aponta_para_o_bucket(model):
+    criar(model, 60)
+
+    assert all(contagem > 0 for contagem in contar_por_shard(model))
+    for i in range(60):
+        user = model.find_user_by_email(f"user{i}@teste.com")
+        assert user["id"] & BUCKET_MASK == email_bucket(user["email"])
+        assert model.find_user_by_id(user["id"])["email"] == user["email"]
+
+
+def test_email_duplicado_entre_shards(model):
+    criar(model, 1)
+
+    ok, msg = model.create_user("hash", "user0@teste.com", "Outro", "Afiliado")
+
+    assert not ok
+    assert "já está em uso" in msg
+
+
+def test_troca_de_email_para_bucket_de_outro_shard(model):
+    criar(model, 2)
+    user = model.find_user_by_email("user0@teste.com")
+    novo = next(
+        f"novo{i}@teste.com"
+        for i in range(1000)
+        if model._shard_of(email_bucket(f"novo{i}@teste.com"))
+        is not model._shard_of(user["id"] & BUCKET_MASK)
+    )
+
+    assert model.update_user_by_id(user["id"], {"email": novo}) == (
+        True,
+        "Usuário atualizado com sucesso!",
+    )
+    assert model.find_user_by_email(novo)["id"] == user["id"]
+    assert model.find_user_by_email("user0@teste.com") is None
+    # O e-mail antigo fica livre e o novo passa a ser único.
+    assert model.create_user("hash", "user0@teste.com", "Reuso", "Afiliado")[0]
+    assert model.update_user_by_id(
+        model.find_user_by_email("user1@teste.com")["id"], {"email": novo}
+    ) == (False, "Erro: O e-mail já está em uso por outro usuário.")
+
+
+def test_delete_remove_usuario_e_email(model):
+    criar(model, 1)
+    user = model.find_user_by_email("user0@teste.com")
+
+    assert model.delete_user_by_id(user["id"]) == (True, "Usuário deletado com sucesso!")
+    assert model.find_user_by_id(user["id"]) is None
+    assert model.create_user("hash", "user0@teste.com", "De novo", "Afiliado")[0]
+    assert model.delete_user_by_id(user["id"]) == (False, "Usuário não encontrado.")
+
+
+def test_listagem_intercala_shards_em_ordem_de_id(model):
+    criar(model, 40)
+
+    todos = model.get_all_users()
+    paginas = [user["id"] for chunk in model.iter_users(chunk_size=7) for user in chunk]
+
+    assert len(todos) == 40
+    assert [user["id"] for user in todos] == sorted(user["id"] for user in todos)
+    assert paginas == [user["id"] for user in todos]
+
+
+def test_reshard_move_buckets_sem_parar_as_leituras(model, shard_names, tmp_path):
+    criar(model, 80)
+    ids = [user["id"] for user in model.get_all_users()]
+    novos = shard_names[:2] + [str(tmp_path / f"novo{i}.db") for i in range(2)]
+    erros = []
+    parar = threading.Event()
+
+    def ler():
+        while not parar.is_set():
+            for user_id in ids[::5]:
+                if model.find_user_by_id(user_id) is None:
+                    erros.append(user_id)
+
+    leitor = threading.Thread(target=ler)
+    leitor.start()
+    movidos = model.reshard(novos, map_path=str(tmp_path / "mapa.json"))
+    parar.set()
+    leitor.join()
+
+    assert erros == []
+    assert movidos > 0
+    assert [shard.db_name for shard in model.shards] == novos
+    assert sum(contar_por_shard(model)) == 80
+    reaberto = ShardedUserModel.from_map_file(str(tmp_path / "mapa.json"))
+    assert [user["id"] for user in reaberto.get_all_users()] == ids
+    assert reaberto.find_user_by_email("user7@teste.com") is not None
+    reaberto.close()
@@ -249,4 +249,73 @@ def test_get_all_users_success(user_service):
     all_users = user_service.get_all_users()
 
     assert all_users == [SAFE_USER_DATA, safe_user2_data]
-    user_service.user_model.get_all_users.assert_called_once()
\ No newline at end of file
+    user_service.user_model.get_all_users.assert_called_once()
+
+def test_register_users_bulk_reports_each_row(user_service, mock_hasher):
+    user_service.user_model.create_users_bulk.side_effect = lambda users: [
+        (True, "Usuário criado com sucesso!"),
+        (False, "Erro: O e-mail 'dup@dominio.com' já está em uso."),
+    ]
+    rows = [
+        {"senha": "12345678", "email": "novo@dominio.com", "nome_completo": "Novo"},
+        {"senha": "123", "email": "curta@dominio.com", "nome_completo": "Curta"},
+        {"senha": "12345678", "email": "dup@dominio.com", "nome_completo": "Dup", "perfil": "Diretoria"},
+    ]
+
+    report = list(user_service.register_users_bulk(rows, processes=0))
+
+    assert [r["sucesso"] for r in report] == [True, False, False]
+    assert report[1]["mensagem"] == "Erros: senha inválida."
+    assert report[2]["linha"] == 3
+    user_service.user_model.create_users_bulk.assert_called_once_with(
+        [
+            ("HASHED_12345678", "novo@dominio.com", "Novo", "Afiliado"),
+            ("HASHED_12345678", "dup@dominio.com", "Dup", "Diretoria"),
+        ]
+    )
+
+
+def test_get_users_page_returns_next_cursor(user_service):
+    user_service.user_model.get_users_page.return_value = [
+        SAFE_USER_DATA.copy(),
+        {**SAFE_USER_DATA, "id": 7},
+    ]
+
+    users, cursor = user_service.get_users_page(after_id=0, page_size=2)
+
+    assert users == [SAFE_USER_DATA, {**SAFE_USER_DATA, "id": 7}]
+    assert cursor == 7
+    user_service.user_model.get_users_page.assert_called_once_with(0, 2)
+
+
+def test_get_users_page_last_page_has_no_cursor(user_service):
+    user_service.user_model.get_users_page.return_value = [SAFE_USER_DATA]
+
+    users, cursor = user_service.get_users_page(after_id=0, page_size=10)
+
+    assert users == [SAFE_USER_DATA]
+    assert cursor is None
+
+
+def test_update_user_profile_with_invalid_token(user_service):
+    success, message = user_service.update_user_profile_with_token(
+        "token-invalido", 1, {"nome_completo": "Novo Nome"}
+    )
+    assert success is False
+    assert message == "Acesso Negado: sessão inválida ou expirada."
+    user_service.user_model.update_user_by_id.assert_not_called()
+
+
+def test_delete_user_with_token_uses_session_profile(user_service):
+    user_service.user_model.delete_user_by_id.return_value = (
+        True,
+        "Usuário deletado com sucesso!",
+    )
+    token = user_service.session_store.create(1, "Diretoria")
+    victim_token = user_service.session_store.create(5, "Afiliado")
+
+    success, _ = user_service.delete_user_with_token(token, 5)
+
+    assert success is True
+    user_service.user_model.delete_user_by_id.assert_called_once_with(5)
+    assert user_service.get_session(victim_token) is None
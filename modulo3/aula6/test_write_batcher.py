@@ -0,0 +1,70 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from database import ConnectionPool
+from user_model import UserModel
+from write_batcher import WriteBatcher
+
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = ConnectionPool(str(tmp_path / "lotes.db"))
+    with pool.connection() as conn:
+        conn.execute("CREATE TABLE itens (id INTEGER PRIMARY KEY, nome TEXT UNIQUE);")
+    yield pool
+    pool.close_all()
+
+
+def inserir(nome):
+    return lambda conn: conn.execute("INSERT INTO itens (nome) VALUES (?);", (nome,)).lastrowid
+
+
+def test_operacoes_agrupadas_em_poucas_transacoes(pool):
+    batcher = WriteBatcher(pool, max_delay_ms=20, max_batch=50)
+    futures = [batcher.submit(inserir(f"item{i}")) for i in range(200)]
+
+    assert sorted(f.result() for f in futures) == list(range(1, 201))
+    assert batcher.batches <= 10
+    batcher.close()
+
+
+def test_falha_desfaz_so_a_propria_operacao(pool):
+    batcher = WriteBatcher(pool, max_delay_ms=20)
+    primeiro = batcher.submit(inserir("repetido"))
+    duplicado = batcher.submit(inserir("repetido"))
+    outro = batcher.submit(inserir("outro"))
+    batcher.close()
+
+    assert primeiro.result() == 1
+    with pytest.raises(Exception):
+        duplicado.result()
+    assert outro.result()
+    with pool.connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM itens;").fetchone()[0] == 2
+
+
+def test_user_model_em_modo_batching(tmp_path):
+    model = UserModel(str(tmp_path / "usuarios.db"), write_batching=True, batch_max_delay_ms=10)
+    futures = [
+        model.submit_create_user("hash", f"user{i}@dominio.com", "Usuario", "Afiliado")
+        for i in range(100)
+    ]
+    assert all(f.result() == (True, "Usuário criado com sucesso!") for f in futures)
+
+    user = model.find_user_by_email("user1@dominio.com")
+    with ThreadPoolExecutor(8) as executor:
+        resultados = list(
+            executor.map(
+                lambda i: model.update_user_by_id(user["id"], {"nome_completo": f"Nome {i}"}),
+                range(40),
+            )
+        )
+
+    assert resultados == [(True, "Usuário atualizado com sucesso!")] * 40
+    assert model.find_user_by_id(user["id"])["nome_completo"].startswith("Nome ")
+    assert model.create_user("hash", "user1@dominio.com", "Dup", "Afiliado") == (
+        False,
+        "Erro: O e-mail 'user1@dominio.com' já está em uso.",
+    )
+    assert model._batcher.batches < model._batcher.operations
+    model.close()
@@ -1,32 +1,69 @@
 # user_model.py
 import sqlite3
+from concurrent.futures import Future
 from datetime import datetime
+from functools import lru_cache
+from typing import Iterator
+
+from cache import UserCache
 from database import DatabaseConnection
+from write_batcher import WriteBatcher
+
+# Colunas que podem sair do model sem expor o hash da senha.
+SAFE_COLUMNS = "id, email, nome_completo, perfil_acesso, data_criacao, data_atualizacao"
+
+# Colunas aceitas por update_user_by_id, na ordem em que entram no SET.
+UPDATABLE_COLUMNS = ("senha_hash", "email", "nome_completo")
+
+
+@lru_cache(maxsize=None)
+def _update_query(columns: tuple[str, ...]) -> str:
+    """
+    Monta (uma vez por combinação de colunas) o UPDATE dinâmico.
+    Reaproveitar o mesmo texto permite ao sqlite3 reutilizar o statement preparado.
+    """
+    assignments = ", ".join(f"{column} = ?" for column in columns)
+    return f"UPDATE usuarios SET {assignments}, data_atualizacao = ? WHERE id = ?;"
 
 
 class UserModel:
 
-    def __init__(self):
-        self.db_conn = DatabaseConnection()
+    def __init__(
+        self,
+        db_name: str = "escola.db",
+        cache_size: int = 1024,
+        cache_ttl: float = 60.0,
+        write_batching: bool = False,
+        batch_max_delay_ms: float = 5.0,
+        batch_max_size: int = 100,
+    ):
+        self.db_conn = DatabaseConnection(db_name)
+        # cache_size=0 desliga o cache de leitura de find_user_by_id/find_user_by_email
+        self.cache = UserCache(cache_size, cache_ttl) if cache_size else None
         self._create_table()
+        # Com write_batching, create/update/delete são gravados em lotes (group commit).
+        self._batcher = (
+            WriteBatcher(self.db_conn.pool, batch_max_delay_ms, batch_max_size)
+            if write_batching
+            else None
+        )
 
     def _create_table(self):
         """Cria a tabela de usuários simplificada (apenas login, nome e perfil)."""
-        self.db_conn.connect()
-        self.db_conn.cursor.execute( # type: ignore
+        with self.db_conn.connection() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS usuarios (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    senha_hash TEXT NOT NULL,
+                    email TEXT NOT NULL UNIQUE,
+                    nome_completo TEXT,
+                    perfil_acesso TEXT DEFAULT 'Afiliado',
+                    data_criacao DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    data_atualizacao DATETIME DEFAULT CURRENT_TIMESTAMP
+                );
             """
-            CREATE TABLE IF NOT EXISTS usuarios (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                senha_hash TEXT NOT NULL,
-                email TEXT NOT NULL UNIQUE,
-                nome_completo TEXT,
-                perfil_acesso TEXT DEFAULT 'Afiliado',
-                data_criacao DATETIME DEFAULT CURRENT_TIMESTAMP,
-                data_atualizacao DATETIME DEFAULT CURRENT_TIMESTAMP
-            );
-        """
-        )
-        self.db_conn.close()
+            )
 
     def create_user(
         self,
@@ -36,8 +73,30 @@ class UserModel:
         perfil_acesso: str,
     ) -> tuple[bool, str]:
         """Cria um novo usuário, usando colunas e placeholders explícitos."""
-        self.db_conn.connect()
+        return self._result(
+            self.submit_create_user(senha_hash, email, nome_completo, perfil_acesso)
+        )
 
+    def submit_create_user(
+        self,
+        senha_hash: str,
+        email: str,
+        nome_completo: str,
+        perfil_acesso: str,
+    ) -> Future:
+        """Como create_user, mas devolve um Future (no modo batching não espera o commit)."""
+        return self._submit_write(
+            self._insert_user, None, senha_hash, email, nome_completo, perfil_acesso
+        )
+
+    def _insert_user(
+        self,
+        conn: sqlite3.Connection,
+        senha_hash: str,
+        email: str,
+        nome_completo: str,
+        perfil_acesso: str,
+    ) -> tuple[bool, str]:
         field_names = "email, senha_hash, nome_completo, perfil_acesso"
         placeholders = "?, ?, ?, ?"
 
@@ -49,40 +108,101 @@ class UserModel:
         )
 
         try:
-            self.db_conn.cursor.execute( # type: ignore
+            conn.execute(
                 f"""
                 INSERT INTO usuarios ({field_names})
                 VALUES ({placeholders});
             """,
                 params,
             )
-            self.db_conn.close()
             return True, "Usuário criado com sucesso!"
         except sqlite3.IntegrityError as e:
-            self.db_conn.close()
-            if "email" in str(e):
-                return False, f"Erro: O e-mail '{email}' já está em uso."
-            return False, f"Erro de integridade ao criar usuário: {e}"
-        except Exception as e:
-            self.db_conn.close()
-            return False, f"Erro desconhecido: {e}"
+            return False, self._integrity_message(e, email)
+
+    def _integrity_message(self, error: sqlite3.IntegrityError, email: str) -> str:
+        """Traduz um IntegrityError do INSERT na mensagem de erro do cadastro."""
+        if "email" in str(error):
+            return f"Erro: O e-mail '{email}' já está em uso."
+        return f"Erro de integridade ao criar usuário: {error}"
+
+    def create_users_bulk(
+        self,
+        users: list[tuple[str, str, str, str]],
+    ) -> list[tuple[bool, str]]:
+        """
+        Cria vários usuários (senha_hash, email, nome_completo, perfil_acesso) em uma
+        única transação usando executemany.
+        Se o lote violar alguma restrição, ele é desfeito e refeito linha a linha na
+        mesma transação, para que cada linha receba o seu próprio resultado.
+        """
+        query = """
+            INSERT INTO usuarios (senha_hash, email, nome_completo, perfil_acesso)
+            VALUES (?, ?, ?, ?);
+        """
+        with self.db_conn.connection() as conn:
+            conn.execute("SAVEPOINT lote_usuarios;")
+            try:
+                conn.executemany(query, users)
+                conn.execute("RELEASE lote_usuarios;")
+                return [(True, "Usuário criado com sucesso!")] * len(users)
+            except sqlite3.IntegrityError:
+                conn.execute("ROLLBACK TO lote_usuarios;")
+                conn.execute("RELEASE lote_usuarios;")
+
+            results = []
+            for user in users:
+                try:
+                    conn.execute(query, user)
+                    results.append((True, "Usuário criado com sucesso!"))
+                except sqlite3.IntegrityError as e:
+                    results.append((False, self._integrity_message(e, user[1])))
+            return results
 
     def find_user_by_id(self, user_id: int):
-        """Busca um usuário pelo ID."""
-        self.db_conn.connect()
-        self.db_conn.cursor.execute("SELECT * FROM usuarios WHERE id = ?;", (user_id,)) # type: ignore
-        user = self.db_conn.cursor.fetchone() # type: ignore
-        self.db_conn.close()
+        """Busca um usuário pelo ID (passando antes pelo cache)."""
+        if self.cache is not None:
+            user = self.cache.get_by_id(user_id)
+            if user is not None:
+                return user
+            generation = self.cache.generation
+        user = self._select_user_by_id(user_id)
+        if self.cache is not None:
+            self.cache.put(user, generation)
         return user
 
     def find_user_by_email(self, email: str):
-        """Busca um usuário pelo e-mail (usado no login)."""
-        self.db_conn.connect()
-        self.db_conn.cursor.execute("SELECT * FROM usuarios WHERE email = ?;", (email,)) # type: ignore
-        user = self.db_conn.cursor.fetchone() # type: ignore
-        self.db_conn.close()
+        """Busca um usuário pelo e-mail (usado no login), passando antes pelo cache."""
+        if self.cache is not None:
+            user = self.cache.get_by_email(email)
+            if user is not None:
+                return user
+            generation = self.cache.generation
+        user = self._select_user_by_email(email)
+        if self.cache is not None:
+            self.cache.put(user, generation)
         return user
 
+    def _select_user_by_id(self, user_id: int):
+        with self.db_conn.connection() as conn:
+            return conn.execute(
+                "SELECT * FROM usuarios WHERE id = ?;", (user_id,)
+            ).fetchone()
+
+    def _select_user_by_email(self, email: str):
+        with self.db_conn.connection() as conn:
+            return conn.execute(
+                "SELECT * FROM usuarios WHERE email = ?;", (email,)
+            ).fetchone()
+
+    def _invalidate_cache(self, user_id: int):
+        """Descarta o usuário do cache depois de uma escrita confirmada."""
+        if self.cache is not None:
+            self.cache.invalidate(user_id)
+
+    def cache_stats(self) -> dict | None:
+        """Retorna os contadores do cache (hits, misses, evictions...), se ativo."""
+        return self.cache.stats() if self.cache is not None else None
+
     def update_user_by_id(
         self,
         user_id: int,
@@ -92,61 +212,132 @@ class UserModel:
         Atualiza informações de um usuário (email, nome_completo, senha_hash) de forma simples.
         A query é construída dinamicamente no SET para garantir flexibilidade de quais campos atualizar.
         """
-        self.db_conn.connect()
-        updates = []
-        params = []
-
-        if updates_data.get("senha_hash"):
-            updates.append("senha_hash = ?")
-            params.append(updates_data["senha_hash"])
-        if updates_data.get("email"):
-            updates.append("email = ?")
-            params.append(updates_data["email"])
-        if updates_data.get("nome_completo"):
-            updates.append("nome_completo = ?")
-            params.append(updates_data["nome_completo"])
-
-        if not updates:
-            self.db_conn.close()
-            return False, "Nenhum dado válido para atualizar."
+        return self._result(self.submit_update_user_by_id(user_id, updates_data))
 
+    def submit_update_user_by_id(self, user_id: int, updates_data: dict) -> Future:
+        """Como update_user_by_id, mas devolve um Future."""
+        columns = tuple(
+            column for column in UPDATABLE_COLUMNS if updates_data.get(column)
+        )
+        if not columns:
+            return self._done_future((False, "Nenhum dado válido para atualizar."))
+
+        params = [updates_data[column] for column in columns]
         # Adiciona data_atualizacao
-        updates.append("data_atualizacao = ?")
         params.append(datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
-
         params.append(user_id)
 
-        query_updates_str = ", ".join(updates)
-        query = f"UPDATE usuarios SET {query_updates_str} WHERE id = ?;"
+        return self._submit_write(self._update_user, user_id, columns, params)
 
+    def _update_user(
+        self,
+        conn: sqlite3.Connection,
+        columns: tuple[str, ...],
+        params: list,
+    ) -> tuple[bool, str]:
         try:
-            self.db_conn.cursor.execute(query, params) # type: ignore
-            rows_affected = self.db_conn.cursor.rowcount # type: ignore
-            self.db_conn.close()
-            if rows_affected > 0:
-                return True, "Usuário atualizado com sucesso!"
-            return False, "Usuário não encontrado."
+            rows_affected = conn.execute(_update_query(columns), params).rowcount
         except sqlite3.IntegrityError:
-            self.db_conn.close()
             return False, f"Erro: O e-mail já está em uso por outro usuário."
-        except Exception as e:
-            self.db_conn.close()
-            return False, f"Erro desconhecido: {e}"
+        if rows_affected > 0:
+            return True, "Usuário atualizado com sucesso!"
+        return False, "Usuário não encontrado."
 
     def delete_user_by_id(self, user_id: int) -> tuple[bool, str]:
         """Deleta um usuário pelo ID."""
-        self.db_conn.connect()
-        self.db_conn.cursor.execute("DELETE FROM usuarios WHERE id = ?;", (user_id,)) # type: ignore
-        rows_affected = self.db_conn.cursor.rowcount # type: ignore
-        self.db_conn.close()
+        return self._result(self.submit_delete_user_by_id(user_id))
+
+    def submit_delete_user_by_id(self, user_id: int) -> Future:
+        """Como delete_user_by_id, mas devolve um Future."""
+        return self._submit_write(self._delete_user, user_id, user_id)
+
+    def _delete_user(self, conn: sqlite3.Connection, user_id: int) -> tuple[bool, str]:
+        rows_affected = conn.execute(
+            "DELETE FROM usuarios WHERE id = ?;", (user_id,)
+        ).rowcount
         if rows_affected > 0:
             return True, "Usuário deletado com sucesso!"
         return False, "Usuário não encontrado."
 
+    def _submit_write(self, operation, invalidate_id: int | None, *args) -> Future:
+        """
+        Executa a escrita `operation(conn, *args)`: direto numa conexão do pool ou,
+        no modo batching, enfileirada no WriteBatcher.
+        O Future devolvido só é resolvido depois do commit e da invalidação do cache.
+        """
+        if self._batcher is not None:
+            written = self._batcher.submit(lambda conn: operation(conn, *args))
+        else:
+            written = Future()
+            try:
+                with self.db_conn.connection() as conn:
+                    written.set_result(operation(conn, *args))
+            except Exception as e:
+                written.set_exception(e)
+
+        if invalidate_id is None:
+            return written
+
+        future: Future = Future()
+
+        def invalidate_then_resolve(done: Future):
+            self._invalidate_cache(invalidate_id)
+            error = done.exception()
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(done.result())
+
+        written.add_done_callback(invalidate_then_resolve)
+        return future
+
+    def _done_future(self, result) -> Future:
+        future: Future = Future()
+        future.set_result(result)
+        return future
+
+    def _result(self, future: Future) -> tuple[bool, str]:
+        """Espera o resultado de uma escrita, convertendo erros inesperados em mensagem."""
+        try:
+            return future.result()
+        except Exception as e:
+            return False, f"Erro desconhecido: {e}"
+
+    def flush_writes(self):
+        """No modo batching, espera até que as escritas pendentes estejam gravadas."""
+        if self._batcher is not None:
+            self._batcher.flush()
+
+    def close(self):
+        """Grava as escritas pendentes e encerra o batcher (se houver)."""
+        if self._batcher is not None:
+            self._batcher.close()
+            self._batcher = None
+
     def get_all_users(self):
         """Retorna todos os usuários."""
-        self.db_conn.connect()
-        self.db_conn.cursor.execute("SELECT * FROM usuarios;") # type: ignore
-        users = self.db_conn.cursor.fetchall() # type: ignore
-        self.db_conn.close()
-        return users
\ No newline at end of file
+        with self.db_conn.connection() as conn:
+            return conn.execute("SELECT * FROM usuarios;").fetchall()
+
+    def get_users_page(self, after_id: int = 0, page_size: int = 50) -> list:
+        """
+        Retorna até `page_size` usuários com id maior que `after_id`, em ordem de id
+        (paginação por chave). Só as colunas seguras são selecionadas.
+        """
+        with self.db_conn.connection() as conn:
+            return conn.execute(
+                f"SELECT {SAFE_COLUMNS} FROM usuarios WHERE id > ? ORDER BY id LIMIT ?;",
+                (after_id, page_size),
+            ).fetchall()
+
+    def iter_users(self, chunk_size: int = 500) -> Iterator[list]:
+        """Percorre a tabela inteira em blocos de até `chunk_size` usuários (colunas seguras)."""
+        after_id = 0
+        while True:
+            chunk = self.get_users_page(after_id, chunk_size)
+            if not chunk:
+                return
+            yield chunk
+            if len(chunk) < chunk_size:
+                return
+            after_id = chunk[-1]["id"]
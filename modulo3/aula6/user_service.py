@@ -1,15 +1,37 @@
 # user_service.py
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Iterable, Iterator
+
+from session_store import SessionStore
 from user_model import UserModel
-from hasher import hash_senha, verificar_senha
+from hasher import (
+    HashTimeoutError,
+    HasherPool,
+    get_hasher_pool,
+    hash_senha,
+    precisa_rehash,
+    verificar_senha,
+)
+
+MENSAGEM_SOBRECARGA = "Erro: Serviço de senhas sobrecarregado, tente novamente."
 
 
 class UserService:
 
-    def __init__(self):
+    def __init__(
+        self,
+        user_model: UserModel | None = None,
+        hasher_pool: HasherPool | None = None,
+        session_store: SessionStore | None = None,
+    ):
         """
         crie um atributo que receberá a UserModel como composição
+        O hash das senhas roda no pool de hash (limitado e com tempo limite).
         """
-        self.user_model = UserModel()
+        self.user_model = user_model if user_model is not None else UserModel()
+        self.hasher_pool = hasher_pool if hasher_pool is not None else get_hasher_pool()
+        self.session_store = session_store if session_store is not None else SessionStore()
 
     def _safe_user_data(self, user: dict) -> dict | None:
         """
@@ -18,6 +40,8 @@ class UserService:
         caso ele não exista retorne None
         """
         if user:
+            # Copia antes de remover: a linha pode ser um sqlite3.Row ou estar no cache.
+            user = dict(user)
             user.pop("senha_hash", None)
             return user
         return None
@@ -57,22 +81,100 @@ class UserService:
         O campo Nome deve ter apenas letras e não deve estar vazio, retorne False se não tiver e a mensagem de erro.
         Caso os campos atendas as requisições, faça o hash da senha e salve use o método create_user da User Model
         """
+        error = self._validate_registration(senha, email, nome_completo)
+        if error:
+            return False, error
+
+        try:
+            senha_hash = self.hasher_pool.run(hash_senha, senha)
+        except HashTimeoutError:
+            return False, MENSAGEM_SOBRECARGA
+        return self.user_model.create_user(senha_hash, email, nome_completo, perfil)
+
+    def _validate_registration(
+        self,
+        senha: str,
+        email: str,
+        nome_completo: str,
+    ) -> str | None:
+        """Aplica as regras de cadastro e retorna a mensagem de erro, ou None se válido."""
         if (
             not email
             or len(email) < 10
             or "@" not in email
             or not email.endswith(".com")
         ):
-            return False, "Erro: Email inválido!"
+            return "Erro: Email inválido!"
 
         if not nome_completo or not nome_completo.replace(" ", "").isalpha():
-            return False, "Erro: Nome completo deve conter apenas letras."
+            return "Erro: Nome completo deve conter apenas letras."
 
         if not senha or len(senha) < 8:
-            return False, "Erros: senha inválida."
+            return "Erros: senha inválida."
 
-        senha_hash = hash_senha(senha)
-        return self.user_model.create_user(senha_hash, email, nome_completo, perfil)
+        return None
+
+    def register_users_bulk(
+        self,
+        rows: Iterable[dict],
+        chunk_size: int = 1000,
+        processes: int | None = None,
+    ) -> Iterator[dict]:
+        """
+        Cadastra usuários em massa a partir de um iterável de dicts
+        (senha, email, nome_completo e, opcionalmente, perfil).
+        As linhas são lidas em lotes de `chunk_size`: cada lote é validado com as
+        mesmas regras do register_user, tem as senhas hasheadas em um pool de
+        processos e é inserido em uma única transação.
+        Gera um relatório por linha: {"linha", "email", "sucesso", "mensagem"}.
+        Com processes=0 o hash é feito no próprio processo.
+        """
+        executor = ProcessPoolExecutor(processes) if processes != 0 else None
+        try:
+            rows_iter = enumerate(rows, start=1)
+            while True:
+                chunk = list(islice(rows_iter, chunk_size))
+                if not chunk:
+                    break
+                yield from self._register_chunk(chunk, executor)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+    def _register_chunk(
+        self,
+        chunk: list[tuple[int, dict]],
+        executor: ProcessPoolExecutor | None,
+    ) -> list[dict]:
+        """Valida, faz o hash e insere um lote do register_users_bulk."""
+        reports = []
+        valid = []
+        for line, row in chunk:
+            email = row.get("email") or ""
+            error = self._validate_registration(
+                row.get("senha") or "", email, row.get("nome_completo") or ""
+            )
+            report = {"linha": line, "email": email, "sucesso": False, "mensagem": error}
+            reports.append(report)
+            if not error:
+                valid.append((report, row))
+
+        senhas = [row["senha"] for _, row in valid]
+        if executor is not None:
+            hashes = executor.map(hash_senha, senhas, chunksize=max(1, len(senhas) // 32))
+        else:
+            hashes = map(hash_senha, senhas)
+
+        users = [
+            (senha_hash, row["email"], row["nome_completo"], row.get("perfil") or "Afiliado")
+            for (_, row), senha_hash in zip(valid, hashes)
+        ]
+        if users:
+            results = self.user_model.create_users_bulk(users)
+            for (report, _), (success, message) in zip(valid, results):
+                report["sucesso"] = success
+                report["mensagem"] = message
+        return reports
 
     def login_user(self, email: str, senha: str) -> tuple[dict | None, str]:
         """
@@ -88,12 +190,27 @@ class UserService:
 
         user = self.user_model.find_user_by_email(email)
 
-        if user and verificar_senha(senha, user.get("senha_hash", "")):
+        if not user:
+            return None, "Erro: Email ou senha inválidos."
+
+        try:
+            valid = self.hasher_pool.run(verificar_senha, senha, user["senha_hash"])
+        except HashTimeoutError:
+            return None, MENSAGEM_SOBRECARGA
+
+        if valid:
+            if precisa_rehash(user["senha_hash"]):
+                # Troca o hash antigo em segundo plano; se a fila estiver cheia, fica para o próximo login.
+                self.hasher_pool.try_submit(self._upgrade_password_hash, user["id"], senha)
             safe_user = self._safe_user_data(user)
             return safe_user, "Login bem-sucedido!"
 
         return None, "Erro: Email ou senha inválidos."
 
+    def _upgrade_password_hash(self, user_id: int, senha: str):
+        """Regrava o hash da senha com o algoritmo e os parâmetros atuais."""
+        self.user_model.update_user_by_id(user_id, {"senha_hash": hash_senha(senha)})
+
     def update_user_profile(
         self,
         current_user_id: int | None,
@@ -113,25 +230,22 @@ class UserService:
         ):
             return False, "Acesso Negado!"
 
+        error = self._validate_profile_update(new_data)
+        if error:
+            return False, error
+
         update_data = {}
 
         if new_data.get("senha"):
-            if len(new_data["senha"]) < 8:
-                return False, "Erro: A nova senha deve ter no mínimo 8 caracteres."
-            update_data["senha_hash"] = hash_senha(new_data["senha"])
+            try:
+                update_data["senha_hash"] = self.hasher_pool.run(hash_senha, new_data["senha"])
+            except HashTimeoutError:
+                return False, MENSAGEM_SOBRECARGA
 
         if new_data.get("email"):
-            if (
-                len(new_data["email"]) < 10
-                or "@" not in new_data["email"]
-                or not new_data["email"].endswith(".com")
-            ):
-                return False, "Erro: O novo email é inválido."
             update_data["email"] = new_data["email"]
 
         if new_data.get("nome_completo"):
-            if not new_data["nome_completo"].replace(" ", "").isalpha():
-                return False, "Erro: O novo nome deve conter apenas letras."
             update_data["nome_completo"] = new_data["nome_completo"]
 
         if update_data:
@@ -139,6 +253,26 @@ class UserService:
 
         return False, "Nenhum dado válido para atualização fornecido."
 
+    def _validate_profile_update(self, new_data: dict) -> str | None:
+        """Valida os campos enviados para update_user_profile (mensagem de erro ou None)."""
+        if new_data.get("senha") and len(new_data["senha"]) < 8:
+            return "Erro: A nova senha deve ter no mínimo 8 caracteres."
+
+        if new_data.get("email") and (
+            len(new_data["email"]) < 10
+            or "@" not in new_data["email"]
+            or not new_data["email"].endswith(".com")
+        ):
+            return "Erro: O novo email é inválido."
+
+        if (
+            new_data.get("nome_completo")
+            and not new_data["nome_completo"].replace(" ", "").isalpha()
+        ):
+            return "Erro: O novo nome deve conter apenas letras."
+
+        return None
+
     def delete_user(
         self,
         current_user_profile: str,
@@ -177,4 +311,65 @@ class UserService:
             safe_user = self._safe_user_data(user)
             if safe_user:
                 safe_users.append(safe_user)
-        return safe_users
\ No newline at end of file
+        return safe_users
+
+    def get_users_page(
+        self,
+        after_id: int = 0,
+        page_size: int = 50,
+    ) -> tuple[list[dict], int | None]:
+        """
+        Retorna uma página de usuários (sem senha) e o cursor da próxima página.
+        O cursor é o id do último usuário da página, ou None se não houver mais páginas.
+        """
+        users = [dict(user) for user in self.user_model.get_users_page(after_id, page_size)]
+        next_cursor = users[-1]["id"] if len(users) == page_size else None
+        return users, next_cursor
+
+    def iter_users(self, chunk_size: int = 500) -> Iterator[list[dict]]:
+        """Gera os usuários (sem senha) em blocos de até `chunk_size`."""
+        for chunk in self.user_model.iter_users(chunk_size):
+            yield [dict(user) for user in chunk]
+
+    def start_session(self, email: str, senha: str) -> tuple[str | None, dict | None, str]:
+        """
+        Faz o login e, se der certo, abre uma sessão.
+        Retorna o token da sessão, o usuário (sem senha) e a mensagem do login.
+        """
+        user, message = self.login_user(email, senha)
+        if not user:
+            return None, None, message
+        token = self.session_store.create(user["id"], user["perfil_acesso"])
+        return token, user, message
+
+    def get_session(self, token: str | None) -> dict | None:
+        """Retorna {"id", "perfil"} do dono do token, ou None se a sessão não for válida."""
+        return self.session_store.get(token)
+
+    def end_session(self, token: str | None):
+        """Encerra a sessão (logout)."""
+        self.session_store.revoke(token)
+
+    def update_user_profile_with_token(
+        self,
+        token: str | None,
+        target_user_id: int,
+        new_data: dict,
+    ) -> tuple[bool, str]:
+        """update_user_profile autorizado pelo token da sessão em vez de id/perfil."""
+        session = self.session_store.get(token)
+        if session is None:
+            return False, "Acesso Negado: sessão inválida ou expirada."
+        return self.update_user_profile(
+            session["id"], session["perfil"], target_user_id, new_data
+        )
+
+    def delete_user_with_token(self, token: str | None, user_id: int) -> tuple[bool, str]:
+        """delete_user autorizado pelo token; as sessões do usuário deletado são encerradas."""
+        session = self.session_store.get(token)
+        if session is None:
+            return False, "Acesso Negado: sessão inválida ou expirada."
+        success, message = self.delete_user(session["perfil"], user_id)
+        if success:
+            self.session_store.revoke_user(user_id)
+        return success, message
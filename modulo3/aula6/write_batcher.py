@@ -0,0 +1,107 @@
+# write_batcher.py
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable
+
+from database import ConnectionPool
+
+Operation = Callable[[sqlite3.Connection], Any]
+
+
+class WriteBatcher:
+    """
+    Group commit: escritas enfileiradas são aplicadas juntas em uma única
+    transação (um único fsync) a cada `max_delay_ms` ou a cada `max_batch`
+    operações, o que acontecer primeiro.
+    Cada operação roda dentro de um SAVEPOINT próprio, então uma falha desfaz
+    só aquela operação. Os futures só são resolvidos depois do commit do lote.
+    """
+
+    def __init__(
+        self,
+        pool: ConnectionPool,
+        max_delay_ms: float = 5.0,
+        max_batch: int = 100,
+    ):
+        self.pool = pool
+        self.max_delay = max_delay_ms / 1000
+        self.max_batch = max_batch
+        self.batches = 0
+        self.operations = 0
+        self._queue: queue.Queue[tuple[Operation, Future] | None] = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="write-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, operation: Operation) -> Future:
+        """Enfileira `operation(conn)` e devolve o Future com o seu resultado."""
+        if self._closed:
+            raise RuntimeError("O WriteBatcher já foi fechado.")
+        future: Future = Future()
+        self._queue.put((operation, future))
+        return future
+
+    def flush(self):
+        """Espera até que tudo o que foi enfileirado antes desta chamada esteja gravado."""
+        self.submit(lambda conn: None).result()
+
+    def close(self):
+        """Grava o que estiver pendente e encerra a thread do batcher."""
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+            self._thread.join()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            deadline = time.monotonic() + self.max_delay
+            stop = False
+            while len(batch) < self.max_batch:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            self._flush(batch)
+            if stop:
+                return
+
+    def _flush(self, batch: list[tuple[Operation, Future]]):
+        results = []
+        try:
+            with self.pool.connection() as conn:
+                for operation, _ in batch:
+                    conn.execute("SAVEPOINT operacao;")
+                    try:
+                        results.append((operation(conn), None))
+                        conn.execute("RELEASE operacao;")
+                    except Exception as e:
+                        conn.execute("ROLLBACK TO operacao;")
+                        conn.execute("RELEASE operacao;")
+                        results.append((None, e))
+        except Exception as e:
+            # O commit do lote falhou: nenhuma operação foi gravada.
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        self.batches += 1
+        self.operations += len(batch)
+        for (_, future), (result, error) in zip(batch, results):
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)